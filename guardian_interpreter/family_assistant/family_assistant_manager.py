@@ -5,7 +5,9 @@ Enhanced with real LLM integration for family-friendly response generation
 """
 
 import logging
+import sys
 import uuid
+from collections.abc import Mapping
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
@@ -20,7 +22,7 @@ try:
     from guardian_interpreter.performance_optimizer import get_optimizer
     from guardian_interpreter.llm_integration import create_llm
 except ImportError as e:
-    print(f"Warning: Could not import some Guardian components: {e}")
+    print(f"Warning: Could not import some Guardian components: {e}", file=sys.stderr)
     # Create minimal fallback classes
     class AuditLogger:
         def __init__(self, *args, **kwargs): pass
@@ -53,7 +55,7 @@ try:
         FamilyContext, FamilyAnalysisResult, SecurityStatus
     )
 except ImportError as e:
-    print(f"Warning: Could not import family models: {e}")
+    print(f"Warning: Could not import family models: {e}", file=sys.stderr)
     # Create minimal fallback classes
     from dataclasses import dataclass
     from typing import List
@@ -199,6 +201,12 @@ class FamilyAssistantManager:
             self.logger.error(f"Failed to initialize family assistant components: {e}")
             raise
     
+    @property
+    def data_version(self):
+        """Changes whenever recommendation inputs change (engine swapped or templates reloaded)"""
+        engine = getattr(self, 'recommendation_engine', None)
+        return (id(engine), getattr(engine, 'data_version', 0))
+    
     def register_family_skill(self, skill_name: str, skill_instance):
         """Register a family skill with the manager"""
         self.family_skills[skill_name] = skill_instance
@@ -298,7 +306,7 @@ class FamilyAssistantManager:
                 })
             
             # Convert dict to FamilyProfile object if needed
-            if isinstance(family_profile, dict):
+            if isinstance(family_profile, Mapping):
                 profile = self._dict_to_family_profile(family_profile)
             else:
                 profile = family_profile
@@ -372,7 +380,7 @@ class FamilyAssistantManager:
         """
         try:
             # Convert dict to FamilyProfile object if needed
-            if isinstance(family_profile, dict):
+            if isinstance(family_profile, Mapping):
                 profile = self._dict_to_family_profile(family_profile)
             else:
                 profile = family_profile
@@ -3,8 +3,11 @@
 # Completely offline operation with no external API calls.
 
 import os
+import mmap
 import logging
-from typing import Optional, Dict, Any
+import platform
+import threading
+from typing import Optional, Dict, Any, Iterator
 
 try:
     from llama_cpp import Llama
@@ -13,6 +16,17 @@ except ImportError:
     LLAMA_CPP_AVAILABLE = False
     Llama = None
 
+# Optional ONNX Runtime backend (pip install onnxruntime optimum[onnxruntime])
+try:
+    import onnxruntime as ort
+    from optimum.onnxruntime import ORTModelForCausalLM, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    from transformers import AutoTokenizer, TextIteratorStreamer
+    ONNXRT_AVAILABLE = True
+except ImportError:
+    ONNXRT_AVAILABLE = False
+    ort = None
+
 class GuardianLLM:
     """
     Local LLM handler for Guardian Interpreter
@@ -20,13 +34,16 @@ class GuardianLLM:
     """
     
     def __init__(self, config: Dict[str, Any], logger: logging.Logger):
+        self.config = config
         self.models = config.get('llm', {}).get('models', {})
         self.current_model = None
         self.logger = logger
         self.llm = None
         self.model_loaded = False
         self.model_path = None
-        self.load_default_model()
+
+    def load_model(self) -> bool:
+        return self.load_default_model()
 
     def load_default_model(self) -> bool:
         if not LLAMA_CPP_AVAILABLE:
@@ -37,11 +54,11 @@ class GuardianLLM:
         self.model_path = llm_config.get('model_path', '/mnt/c/Users/works/Desktop/Offline AI Cyber Sec/guardian_interpreter_v1.0.0/guardian_interpreter/models/Phi-3-mini-4k-instruct-q4.gguf')
 
         if not os.path.exists(self.model_path):
-            self.logger.error(f"Model file not found: {self.model_path}")
+            self.logger.error("Model file not found: %s", self.model_path)
             return False
 
         try:
-            self.logger.info(f"Loading LLM model: {self.model_path}")
+            self.logger.info("Loading LLM model: %s", self.model_path)
             self.llm = Llama(
                 model_path=self.model_path,
                 n_ctx=llm_config.get('context_length', 4096),
@@ -52,13 +69,35 @@ class GuardianLLM:
             self.logger.info("LLM model loaded successfully")
             return True
         except Exception as e:
-            self.logger.error(f"Failed to load LLM model: {e}")
+            self.logger.error("Failed to load LLM model: %s", e)
             self.model_loaded = False
             return False
 
     def is_loaded(self) -> bool:
         return self.model_loaded and self.llm is not None
 
+    def prefetch_model_file(self):
+        """Pull the model weights into the page cache so first inference doesn't fault them in"""
+        if not self.model_path or not os.path.isfile(self.model_path):
+            return
+        try:
+            with open(self.model_path, 'rb') as f:
+                if hasattr(os, 'posix_fadvise'):
+                    os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    if hasattr(mmap, 'MADV_WILLNEED'):
+                        try:
+                            mm.madvise(mmap.MADV_WILLNEED)
+                        except OSError as e:
+                            # Some filesystems reject the hint; it is only an optimization
+                            self.logger.debug("madvise not supported for %s: %s", self.model_path, e)
+                    else:
+                        # No madvise on this platform; touch one byte per page instead
+                        for offset in range(0, len(mm), mmap.PAGESIZE):
+                            mm[offset]
+        except (OSError, ValueError) as e:
+            self.logger.warning("Could not prefetch model file: %s", e)
+
     def generate_response(self, prompt: str, system_prompt: str = None) -> str:
         if not self.is_loaded():
             return "Error: LLM model not loaded. Please check configuration and model file."
@@ -66,7 +105,7 @@ class GuardianLLM:
         try:
             llm_config = self.config.get('llm', {})
             full_prompt = self._prepare_prompt(prompt, system_prompt)
-            self.logger.info(f"Generating response for prompt: {prompt[:100]}...")
+            self.logger.info("Generating response for prompt: %.100s...", prompt)
             response = self.llm(
                 full_prompt,
                 max_tokens=llm_config.get('max_tokens', 512),
@@ -75,13 +114,39 @@ class GuardianLLM:
                 echo=False
             )
             generated_text = response['choices'][0]['text'].strip()
-            self.logger.info(f"Generated response: {generated_text[:100]}...")
+            self.logger.info("Generated response: %.100s...", generated_text)
             return generated_text
         except Exception as e:
             error_msg = f"Error generating response: {e}"
             self.logger.error(error_msg)
             return error_msg
 
+    def generate_response_stream(self, prompt: str, system_prompt: str = None) -> Iterator[str]:
+        """Yield the response incrementally as the model generates tokens"""
+        if not self.is_loaded():
+            yield "Error: LLM model not loaded. Please check configuration and model file."
+            return
+
+        try:
+            llm_config = self.config.get('llm', {})
+            full_prompt = self._prepare_prompt(prompt, system_prompt)
+            self.logger.info("Streaming response for prompt: %.100s...", prompt)
+            for chunk in self.llm(
+                full_prompt,
+                max_tokens=llm_config.get('max_tokens', 512),
+                temperature=llm_config.get('temperature', 0.7),
+                stop=["Human:", "User:", "\n\n"],
+                echo=False,
+                stream=True
+            ):
+                text = chunk['choices'][0]['text']
+                if text:
+                    yield text
+        except Exception as e:
+            error_msg = f"Error generating response: {e}"
+            self.logger.error(error_msg)
+            yield error_msg
+
     def _prepare_prompt(self, user_prompt: str, system_prompt: str = None) -> str:
         if system_prompt:
             return f"System: {system_prompt}\n\nHuman: {user_prompt}\n\nAssistant:"
@@ -117,6 +182,147 @@ class GuardianLLM:
             self.model_loaded = False
             self.logger.info("LLM model unloaded")
 
+class OnnxLLM(GuardianLLM):
+    """
+    ONNX Runtime backend for Guardian Interpreter
+    Quantizes the exported model to int8 once, then loads it with full graph
+    optimizations and caches the optimized graph so later starts skip that work.
+    """
+
+    def __init__(self, config: Dict[str, Any], logger: logging.Logger):
+        self.config = config
+        self.models = config.get('llm', {}).get('models', {})
+        self.current_model = None
+        self.logger = logger
+        self.llm = None
+        self.tokenizer = None
+        self.model_loaded = False
+        self.model_path = config.get('llm', {}).get('onnx_model_path', 'models/onnx')
+
+    @staticmethod
+    def _quantization_config():
+        """Pick the dynamic int8 quantization config for this CPU"""
+        machine = platform.machine().lower()
+        if machine in ('aarch64', 'arm64'):
+            return AutoQuantizationConfig.arm64(is_static=False, per_channel=False)
+        if machine in ('x86_64', 'amd64') and 'avx512_vnni' in _cpu_flags():
+            return AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+        return AutoQuantizationConfig.avx2(is_static=False, per_channel=False)
+
+    def _quantize(self) -> str:
+        """Quantize the exported model ahead of time; reuses the result on later runs"""
+        quantized_dir = f"{self.model_path.rstrip(os.sep)}-int8-{platform.machine().lower()}"
+        if not os.path.isdir(quantized_dir):
+            self.logger.info("Quantizing ONNX model to %s", quantized_dir)
+            quantizer = ORTQuantizer.from_pretrained(self.model_path)
+            quantizer.quantize(save_dir=quantized_dir, quantization_config=self._quantization_config())
+            AutoTokenizer.from_pretrained(self.model_path).save_pretrained(quantized_dir)
+        return quantized_dir
+
+    def load_model(self) -> bool:
+        if not ONNXRT_AVAILABLE:
+            self.logger.error("onnxruntime not available. Install with: pip install onnxruntime optimum[onnxruntime]")
+            return False
+
+        if not os.path.isdir(self.model_path):
+            self.logger.error("ONNX model directory not found: %s", self.model_path)
+            return False
+
+        try:
+            model_dir = self._quantize()
+            file_name = 'model_quantized.onnx'
+            optimized_name = 'model_quantized_opt.onnx'
+
+            sess_options = ort.SessionOptions()
+            sess_options.intra_op_num_threads = self.config.get('llm', {}).get('threads', 4)
+            if os.path.exists(os.path.join(model_dir, optimized_name)):
+                # Graph was optimized on a previous start; load it as-is
+                file_name = optimized_name
+                sess_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+            else:
+                sess_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+                sess_options.optimized_model_filepath = os.path.join(model_dir, optimized_name)
+
+            self.logger.info("Loading ONNX model: %s", os.path.join(model_dir, file_name))
+            self.llm = ORTModelForCausalLM.from_pretrained(
+                model_dir, file_name=file_name, session_options=sess_options
+            )
+            self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+            self.model_loaded = True
+            self.logger.info("ONNX model loaded successfully")
+            return True
+        except Exception as e:
+            self.logger.error("Failed to load ONNX model: %s", e)
+            self.model_loaded = False
+            return False
+
+    load_default_model = load_model
+
+    def _generate_kwargs(self, prompt: str, system_prompt: str = None) -> Dict[str, Any]:
+        llm_config = self.config.get('llm', {})
+        inputs = self.tokenizer(self._prepare_prompt(prompt, system_prompt), return_tensors='pt')
+        return dict(
+            inputs,
+            max_new_tokens=llm_config.get('max_tokens', 512),
+            temperature=llm_config.get('temperature', 0.7),
+            do_sample=True
+        )
+
+    def generate_response(self, prompt: str, system_prompt: str = None) -> str:
+        return ''.join(self.generate_response_stream(prompt, system_prompt)).strip()
+
+    def generate_response_stream(self, prompt: str, system_prompt: str = None) -> Iterator[str]:
+        if not self.is_loaded():
+            yield "Error: LLM model not loaded. Please check configuration and model file."
+            return
+
+        try:
+            self.logger.info("Streaming response for prompt: %.100s...", prompt)
+            streamer = TextIteratorStreamer(self.tokenizer, skip_prompt=True, skip_special_tokens=True)
+            kwargs = dict(self._generate_kwargs(prompt, system_prompt), streamer=streamer)
+            errors = []
+
+            def generate():
+                # generate() only ends the streamer when it finishes normally;
+                # end it here too, or the loop below would wait forever
+                try:
+                    self.llm.generate(**kwargs)
+                except Exception as e:
+                    errors.append(e)
+                    streamer.end()
+
+            worker = threading.Thread(target=generate, daemon=True)
+            worker.start()
+            for text in streamer:
+                if text:
+                    yield text
+            worker.join()
+            if errors:
+                raise errors[0]
+        except Exception as e:
+            self.logger.error("Error generating response: %s", e)
+            yield f"Error generating response: {e}"
+
+    def get_model_info(self) -> Dict[str, Any]:
+        info = super().get_model_info()
+        info.update({'backend': 'onnxrt', 'available': ONNXRT_AVAILABLE})
+        return info
+
+    def unload_model(self):
+        super().unload_model()
+        self.tokenizer = None
+
+def _cpu_flags() -> str:
+    """Return the CPU feature flags line from /proc/cpuinfo, or '' if unavailable"""
+    try:
+        with open('/proc/cpuinfo') as f:
+            for line in f:
+                if line.startswith('flags'):
+                    return line
+    except OSError:
+        pass
+    return ''
+
 class MockLLM:
     def __init__(self, config: Dict[str, Any], logger: logging.Logger):
         self.config = config
@@ -140,6 +346,12 @@ class MockLLM:
         response_index = hash(prompt) % len(responses)
         return responses[response_index]
 
+    def generate_response_stream(self, prompt: str, system_prompt: str = None) -> Iterator[str]:
+        words = self.generate_response(prompt, system_prompt).split(' ')
+        yield words[0]
+        for word in words[1:]:
+            yield ' ' + word
+
     def get_model_info(self) -> Dict[str, Any]:
         return {
             'loaded': True,
@@ -152,6 +364,9 @@ class MockLLM:
         self.model_loaded = False
 
 def create_llm(config: Dict[str, Any], logger: logging.Logger) -> GuardianLLM:
+    backend = config.get('llm', {}).get('backend', 'llama_cpp')
+    if backend == 'onnxrt' and ONNXRT_AVAILABLE:
+        return OnnxLLM(config, logger)
     if LLAMA_CPP_AVAILABLE:
         return GuardianLLM(config, logger)
     else:
@@ -1,8 +1,18 @@
 import sys
+import atexit
+import concurrent.futures
+import contextlib
 import logging
 import yaml
 import os
 from pathlib import Path
+from types import MappingProxyType
+
+# readline is unavailable on some platforms (e.g. Windows); the CLI works without it
+try:
+    import readline
+except ImportError:
+    readline = None
 
 # Import Guardian components
 try:
@@ -10,14 +20,138 @@ try:
     from guardian_interpreter.network_security import NetworkSecurityManager, AuditLogger
     from guardian_interpreter.family_assistant.family_assistant_manager import FamilyAssistantManager
     from guardian_interpreter.family_assistant.skill_registry import FamilySkillRegistry
-    from guardian_interpreter.family_llm_prompts import FamilyContext, ChildSafetyLevel
+    from guardian_interpreter.family_llm_prompts import FamilyContext, ChildSafetyLevel, FamilyPromptManager
     from guardian_interpreter.skills import family_cyber_skills, threat_analysis_skill, device_guidance_skill, child_education_skill
     
+    # Enum members used when routing queries to an LLM prompt context
+    _CTX_GENERAL = FamilyContext.GENERAL
+    _CTX_CHILD = FamilyContext.CHILD_EDUCATION
+    _CTX_THREAT = FamilyContext.THREAT_EXPLANATION
+    _CTX_DEVICE = FamilyContext.DEVICE_SECURITY
+    _CTX_PARENT = FamilyContext.PARENT_GUIDANCE
+    _SAFETY_STD = ChildSafetyLevel.STANDARD
+    _SAFETY_MOD = ChildSafetyLevel.MODERATE
+    
     LLM_AVAILABLE = True
 except ImportError as e:
-    print(f"Warning: Could not import Guardian components: {e}")
+    print(f"Warning: Could not import Guardian components: {e}", file=sys.stderr)
     LLM_AVAILABLE = False
 
+# Default family data used by the CLI commands. The family manager only reads
+# these, so they are shared read-only templates (nested values included) rather
+# than dicts rebuilt on every command.
+_DEFAULT_PROFILE = MappingProxyType({
+    'family_id': 'guardian_family',
+    'family_name': 'Guardian Family',
+    'members': (MappingProxyType({'name': 'Parent', 'age_group': 'adult', 'tech_skill_level': 'intermediate'}),),
+    'devices': (),
+    'security_preferences': MappingProxyType({'threat_tolerance': 'medium', 'auto_recommendations': True})
+})
+
+_DEFAULT_QUERY_CONTEXT = MappingProxyType({
+    'family_profile': MappingProxyType({
+        'family_id': 'guardian_family',
+        'members': (MappingProxyType({'age_group': 'adult', 'tech_skill_level': 'intermediate'}),)
+    })
+})
+
+# 'family <subcommand>' handlers that take no arguments
+_FAMILY_CMDS = {
+    'help': 'show_family_help',
+    'skills': 'list_family_skills',
+    'analyze': 'analyze_family_security',
+    'recommendations': 'get_family_recommendations',
+    'status': 'show_family_status'
+}
+
+_TOP_LEVEL_CMDS = ('ask', 'exit', 'family', 'help', 'quit')
+_FAMILY_SUBCMDS = tuple(sorted(set(_FAMILY_CMDS) | {'skill'}))
+_HISTORY_FILE = Path.home() / '.guardian_history'
+
+# Prompt scaffold for LLM-enhanced answers; only the query and skill response vary
+_ENH_TMPL = """
+Based on this cybersecurity question: "{query}"
+
+And this technical guidance: "{skill_response}"
+
+Please provide a comprehensive, family-friendly response that:
+1. Explains the cybersecurity concept in simple terms
+2. Provides practical steps the family can take
+3. Uses analogies that relate to everyday family life
+4. Prioritizes the most important actions first
+5. Encourages good cybersecurity habits
+
+Keep the response helpful, encouraging, and actionable for a family audience.
+"""
+
+# An enhanced answer must be longer than this before it is shown
+_MIN_ENHANCED_LEN = 50
+
+# generate_response_stream reports failures as text chunks with these prefixes
+_LLM_ERROR_PREFIXES = ("Error: LLM model not loaded", "Error generating response:")
+
+def _print_block(lines):
+    """Write several output lines to the terminal in a single call"""
+    sys.stdout.write('\n'.join(lines) + '\n')
+
+def _complete_command(text, state):
+    """readline completer for CLI commands and family subcommands"""
+    line = readline.get_line_buffer().lstrip()
+    candidates = _FAMILY_SUBCMDS if line.startswith('family ') else _TOP_LEVEL_CMDS
+    matches = [c for c in candidates if c.startswith(text)]
+    return matches[state] if state < len(matches) else None
+
+def _load_config(logger) -> dict:
+    """Load Guardian configuration"""
+    config_path = Path(__file__).parent / 'config.yaml'
+    if config_path.exists():
+        try:
+            with open(config_path, 'r') as f:
+                return yaml.safe_load(f)
+        except Exception as e:
+            logger.error("Error loading config: %s", e)
+    
+    # Default configuration
+    return {
+        'llm': {
+            'model_path': 'models/guardian-model.gguf',
+            'context_length': 4096,
+            'max_tokens': 512,
+            'temperature': 0.7,
+            'threads': 4
+        },
+        'family_assistant': {
+            'enabled': True,
+            'gui_enabled': True,
+            'default_interface': 'cli',
+            'family_data_path': 'data/families'
+        }
+    }
+
+def _create_family_manager(config: dict, logger, audit_logger):
+    """Create the family assistant manager with the family skills registered"""
+    family_manager = FamilyAssistantManager(
+        config=config,
+        logger=logger,
+        audit_logger=audit_logger
+    )
+    
+    try:
+        # Skills are already imported at module level; each module
+        # exposes run(), which is all the manager calls
+        for skill_module in (family_cyber_skills, threat_analysis_skill,
+                             device_guidance_skill, child_education_skill):
+            family_manager.register_family_skill(
+                skill_module.__name__.rpartition('.')[2], skill_module
+            )
+        
+        logger.info("Family skills registered successfully")
+        
+    except Exception as e:
+        logger.error("Error registering family skills: %s", e)
+    
+    return family_manager
+
 class GuardianCLI:
     def __init__(self):
         self.logger = logging.getLogger('guardian')
@@ -26,93 +160,34 @@ class GuardianCLI:
         # Initialize LLM
         if LLM_AVAILABLE:
             self.llm = create_llm(self.config, self.logger)
-            self.llm.load_model()
+            
+            # Load the model in the background so startup and the first prompt
+            # aren't blocked on it; _ensure_llm_ready() joins before first use
+            loader = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+            self._load_fut = loader.submit(self._load_llm)
+            loader.shutdown(wait=False)
+            self.prompt_manager = FamilyPromptManager()
             
             # Initialize audit logger
             self.audit_logger = AuditLogger(self.config, self.logger)
             
-            # Initialize family assistant manager
-            self.family_manager = FamilyAssistantManager(
-                config=self.config,
-                logger=self.logger,
-                audit_logger=self.audit_logger
-            )
-            
-            # Register family skills
-            self._register_family_skills()
+            # Initialize family assistant manager and register family skills
+            self.family_manager = _create_family_manager(self.config, self.logger, self.audit_logger)
             
             self.logger.info("Guardian CLI initialized with real LLM integration")
         else:
             self.family_manager = self._create_fallback_manager()
             self.llm = None
+            self._load_fut = None
             self.audit_logger = None
             self.logger.warning("Guardian CLI initialized with fallback manager")
     
     def _load_config(self) -> dict:
         """Load Guardian configuration"""
-        config_path = Path(__file__).parent / 'config.yaml'
-        if config_path.exists():
-            try:
-                with open(config_path, 'r') as f:
-                    return yaml.safe_load(f)
-            except Exception as e:
-                self.logger.error(f"Error loading config: {e}")
-        
-        # Default configuration
-        return {
-            'llm': {
-                'model_path': 'models/guardian-model.gguf',
-                'context_length': 4096,
-                'max_tokens': 512,
-                'temperature': 0.7,
-                'threads': 4
-            },
-            'family_assistant': {
-                'enabled': True,
-                'gui_enabled': True,
-                'default_interface': 'cli',
-                'family_data_path': 'data/families'
-            }
-        }
+        return _load_config(self.logger)
     
-    def _register_family_skills(self):
-        """Register all family skills with the manager"""
-        try:
-            # Skills are already imported at module level
-            
-            # Create skill wrapper class for compatibility
-            class SkillWrapper:
-                def __init__(self, skill_func, name):
-                    self.skill_func = skill_func
-                    self.name = name
-                
-                def run(self, *args, **kwargs):
-                    return self.skill_func(*args, **kwargs)
-            
-            # Register skills
-            self.family_manager.register_family_skill(
-                'family_cyber_skills', 
-                SkillWrapper(family_cyber_skills.run, 'family_cyber_skills')
-            )
-            self.family_manager.register_family_skill(
-                'threat_analysis_skill', 
-                SkillWrapper(threat_analysis_skill.run, 'threat_analysis_skill')
-            )
-            self.family_manager.register_family_skill(
-                'device_guidance_skill', 
-                SkillWrapper(device_guidance_skill.run, 'device_guidance_skill')
-            )
-            self.family_manager.register_family_skill(
-                'child_education_skill', 
-                SkillWrapper(child_education_skill.run, 'child_education_skill')
-            )
-            
-            self.logger.info("Family skills registered successfully")
-            
-        except Exception as e:
-            self.logger.error(f"Error registering family skills: {e}")
-    
-    def _create_fallback_manager(self):
+    @staticmethod
+    def _create_fallback_manager():
         """Create fallback manager when LLM is not available"""
         class FallbackFamilyManager:
             def __init__(self):
@@ -166,16 +241,16 @@ Examples:
         if not self.family_manager:
             print("Family assistant not available.")
             return
-        print("\nAvailable Family Skills:")
-        print("-" * 40)
+        lines = ["\nAvailable Family Skills:", "-" * 40]
         skills = self.family_manager.family_skills
         if not skills:
-            print("No family skills registered.")
+            lines.append("No family skills registered.")
+            _print_block(lines)
             return
-        for i, (name, skill) in enumerate(skills.items(), 1):
-            description = "Family cybersecurity skill"
-            print(f"{i:2d}. {name:<25} - {description}")
-        print()
+        description = "Family cybersecurity skill"
+        lines += [f"{i:2d}. {name:<25} - {description}" for i, name in enumerate(skills, 1)]
+        lines.append("")
+        _print_block(lines)
     def run_family_skill(self, skill_name, *args):
         if not self.family_manager:
             print("Family assistant not available.")
@@ -199,21 +274,14 @@ Examples:
                     print(f"✗ Family skill '{skill_name}' failed: {result.get('error', 'Unknown error')}")
         except Exception as e:
             print(f"✗ Error running family skill '{skill_name}': {e}")
-            self.logger.error(f"Family skill execution error: {e}")
+            self.logger.error("Family skill execution error: %s", e)
     def analyze_family_security(self):
         if not self.family_manager:
             print("Family assistant not available.")
             return
         try:
-            default_profile = {
-                'family_id': 'guardian_family',
-                'family_name': 'Guardian Family',
-                'members': [{'name': 'Parent', 'age_group': 'adult', 'tech_skill_level': 'intermediate'}],
-                'devices': [],
-                'security_preferences': {'threat_tolerance': 'medium', 'auto_recommendations': True}
-            }
             print("Analyzing family security posture...")
-            analysis = self.family_manager.analyze_family_security(default_profile)
+            analysis = self.family_manager.analyze_family_security(_DEFAULT_PROFILE)
             print(f"\nFamily Security Analysis:")
             print(f"Status: {analysis.status}")
             print(f"Overall Score: {analysis.overall_score:.1f}/100")
@@ -227,33 +295,26 @@ Examples:
                     print(f"  {i}. {rec.title} (Priority: {rec.priority})")
         except Exception as e:
             print(f"✗ Error analyzing family security: {e}")
-            self.logger.error(f"Family security analysis error: {e}")
+            self.logger.error("Family security analysis error: %s", e)
     def get_family_recommendations(self):
         if not self.family_manager:
             print("Family assistant not available.")
             return
         try:
-            default_profile = {
-                'family_id': 'guardian_family',
-                'family_name': 'Guardian Family',
-                'members': [{'name': 'Parent', 'age_group': 'adult', 'tech_skill_level': 'intermediate'}],
-                'devices': [],
-                'security_preferences': {'threat_tolerance': 'medium', 'auto_recommendations': True}
-            }
             print("Generating family security recommendations...")
-            recommendations = self.family_manager.get_family_recommendations(default_profile)
+            recommendations = self.family_manager.get_family_recommendations(_DEFAULT_PROFILE)
             if recommendations:
-                print(f"\nFamily Security Recommendations:")
-                print("-" * 40)
+                lines = ["\nFamily Security Recommendations:", "-" * 40]
                 for i, rec in enumerate(recommendations, 1):
-                    print(f"{i}. {rec.title}")
-                    print(f"   Priority: {rec.priority} | Difficulty: {rec.difficulty}")
-                    print(f"   {rec.description}\n")
+                    lines.append(f"{i}. {rec.title}")
+                    lines.append(f"   Priority: {rec.priority} | Difficulty: {rec.difficulty}")
+                    lines.append(f"   {rec.description}\n")
+                _print_block(lines)
             else:
                 print("No recommendations available at this time.")
         except Exception as e:
             print(f"✗ Error getting family recommendations: {e}")
-            self.logger.error(f"Family recommendations error: {e}")
+            self.logger.error("Family recommendations error: %s", e)
     def show_family_status(self):
         print("Family Assistant is running. All systems nominal.")
     def process_family_query(self, query, subcommand=None, args=None):
@@ -261,26 +322,22 @@ Examples:
             print("Family assistant not available.")
             return
         try:
-            # Create family context
-            context = {
-                'family_profile': {
-                    'family_id': 'guardian_family', 
-                    'members': [{'age_group': 'adult', 'tech_skill_level': 'intermediate'}]
-                }
-            }
+            context = _DEFAULT_QUERY_CONTEXT
             
             # Process query through family assistant manager
             result = self.family_manager.process_family_query(query, context)
             
-            # If LLM is available, enhance response with LLM-generated content
-            if self.llm and self.llm.is_loaded() and LLM_AVAILABLE:
+            print("\nFamily Assistant Response:")
+            
+            # If LLM is available, stream an enhanced response as it is generated
+            if LLM_AVAILABLE and self._ensure_llm_ready():
                 enhanced_response = self._enhance_response_with_llm(query, result, context)
                 if enhanced_response:
                     result['response'] = enhanced_response
                     result['llm_enhanced'] = True
             
-            print("\nFamily Assistant Response:")
-            print(result.get('response', 'No response available'))
+            if not result.get('llm_enhanced'):
+                print(result.get('response', 'No response available'))
             
             # Show confidence if available
             confidence = result.get('confidence', 0)
@@ -312,66 +369,134 @@ Examples:
                 
         except Exception as e:
             print(f"✗ Error processing family query: {e}")
-            self.logger.error(f"Family query processing error: {e}")
+            self.logger.error("Family query processing error: %s", e)
+    
+    def _load_llm(self) -> bool:
+        """Load the model and warm its pages; runs on the background loader thread"""
+        loaded = self.llm.load_model()
+        if loaded and hasattr(self.llm, 'prefetch_model_file'):
+            self.llm.prefetch_model_file()
+        return loaded
+    
+    def _ensure_llm_ready(self) -> bool:
+        """Wait for the background model load to finish; True if the LLM is usable"""
+        if self._load_fut is not None:
+            try:
+                self._load_fut.result()
+            except Exception as e:
+                self.logger.error("Error loading LLM model: %s", e)
+            self._load_fut = None
+        return self.llm is not None and self.llm.is_loaded()
     
     def _enhance_response_with_llm(self, query: str, skill_result: dict, context: dict) -> str:
-        """Enhance skill response with LLM-generated family-friendly content"""
+        """Stream an LLM-enhanced family-friendly response to stdout and return it"""
+        parts = []
+        streaming = False
         try:
             # Determine family context for LLM prompting
-            family_context = FamilyContext.GENERAL
+            family_context = _CTX_GENERAL
             child_safe_mode = False
-            safety_level = ChildSafetyLevel.STANDARD
+            safety_level = _SAFETY_STD
             
             # Detect context from query
             query_lower = query.lower()
             if any(word in query_lower for word in ['child', 'kid', 'young']):
-                family_context = FamilyContext.CHILD_EDUCATION
+                family_context = _CTX_CHILD
                 child_safe_mode = True
-                safety_level = ChildSafetyLevel.MODERATE
+                safety_level = _SAFETY_MOD
             elif any(word in query_lower for word in ['threat', 'attack', 'danger']):
-                family_context = FamilyContext.THREAT_EXPLANATION
+                family_context = _CTX_THREAT
             elif any(word in query_lower for word in ['device', 'phone', 'computer']):
-                family_context = FamilyContext.DEVICE_SECURITY
+                family_context = _CTX_DEVICE
             elif any(word in query_lower for word in ['parent', 'family']):
-                family_context = FamilyContext.PARENT_GUIDANCE
+                family_context = _CTX_PARENT
             
             # Create enhanced prompt combining skill result with user query
             skill_response = skill_result.get('response', '')
-            enhancement_prompt = f"""
-Based on this cybersecurity question: "{query}"
-
-And this technical guidance: "{skill_response}"
-
-Please provide a comprehensive, family-friendly response that:
-1. Explains the cybersecurity concept in simple terms
-2. Provides practical steps the family can take
-3. Uses analogies that relate to everyday family life
-4. Prioritizes the most important actions first
-5. Encourages good cybersecurity habits
-
-Keep the response helpful, encouraging, and actionable for a family audience.
-"""
+            enhancement_prompt = _ENH_TMPL.format(query=query, skill_response=skill_response)
             
             # Generate enhanced response using family-friendly LLM prompts
-            enhanced_response = self.llm.generate_family_response(
-                enhancement_prompt,
+            system_prompt = self.prompt_manager.get_system_prompt(
                 context=family_context,
                 child_safe_mode=child_safe_mode,
                 safety_level=safety_level,
                 family_profile=context.get('family_profile')
             )
             
-            # Validate the enhanced response
-            if enhanced_response and len(enhanced_response.strip()) > 50:
-                return enhanced_response
-            else:
+            # Hold tokens back until the response is known to be usable, then
+            # stream the rest as it arrives. Once anything is printed the
+            # streamed text is the answer, so the caller never prints twice.
+            for token in self.llm.generate_response_stream(enhancement_prompt, system_prompt):
+                if streaming:
+                    if token.startswith(_LLM_ERROR_PREFIXES):
+                        self.logger.warning("LLM enhancement stopped early: %s", token)
+                        break
+                    sys.stdout.write(token)
+                    sys.stdout.flush()
+                    parts.append(token)
+                    continue
+                
+                parts.append(token)
+                pending = ''.join(parts)
+                if pending.lstrip().startswith(_LLM_ERROR_PREFIXES):
+                    self.logger.warning("LLM enhancement failed: %s", pending)
+                    return None
+                if len(pending.strip()) > _MIN_ENHANCED_LEN:
+                    sys.stdout.write(pending)
+                    sys.stdout.flush()
+                    streaming = True
+            
+            if not streaming:
                 self.logger.warning("LLM enhancement produced insufficient response")
                 return None
+            
+            sys.stdout.write('\n')
+            return ''.join(parts)
                 
         except Exception as e:
-            self.logger.error(f"Error enhancing response with LLM: {e}")
+            self.logger.error("Error enhancing response with LLM: %s", e)
+            if streaming:
+                # Part of the answer is already on screen; keep it as the answer
+                sys.stdout.write('\n')
+                return ''.join(parts)
             return None
+    def _setup_readline(self):
+        """Enable line editing, persistent history and tab completion"""
+        if readline is None:
+            return
+        try:
+            readline.read_history_file(_HISTORY_FILE)
+        except OSError:
+            pass  # No history yet
+        atexit.register(readline.write_history_file, _HISTORY_FILE)
+        readline.set_completer(_complete_command)
+        if 'libedit' in (readline.__doc__ or ''):
+            readline.parse_and_bind('bind ^I rl_complete')
+        else:
+            readline.parse_and_bind('tab: complete')
+    
+    def _family_handlers(self):
+        """Map each 'family' subcommand to a handler taking the rest of the line"""
+        handlers = {sub: (lambda rest, method=getattr(self, name): method())
+                    for sub, name in _FAMILY_CMDS.items()}
+        handlers[''] = handlers['help']
+        handlers['skill'] = self._dispatch_skill
+        return handlers
+
+    def _dispatch_skill(self, rest):
+        # Only the skill subcommand needs a full argv
+        skill_argv = rest.split()
+        if not skill_argv:
+            print("Usage: family skill <skill_name> [arguments]")
+        else:
+            self.run_family_skill(*skill_argv)
+
+    def _unknown_family_subcommand(self, rest):
+        print("Unknown family subcommand.")
+
     def family_cli_loop(self):
+        self._setup_readline()
+        family_handlers = self._family_handlers()
         print("Guardian Family Assistant CLI. Type 'help' for commands.")
         while True:
             try:
@@ -383,30 +508,13 @@ Keep the response helpful, encouraging, and actionable for a family audience.
                 if command == 'help':
                     self.show_family_help()
                     continue
-                parts = command.split()
-                if parts[0] == 'family':
-                    if len(parts) == 1 or parts[1] == 'help':
-                        self.show_family_help()
-                    elif parts[1] == 'skills':
-                        self.list_family_skills()
-                    elif parts[1] == 'skill':
-                        if len(parts) < 3:
-                            print("Usage: family skill <skill_name> [arguments]")
-                        else:
-                            skill_name = parts[2]
-                            skill_args = parts[3:] if len(parts) > 3 else []
-                            self.run_family_skill(skill_name, *skill_args)
-                    elif parts[1] == 'analyze':
-                        self.analyze_family_security()
-                    elif parts[1] == 'recommendations':
-                        self.get_family_recommendations()
-                    elif parts[1] == 'status':
-                        self.show_family_status()
-                    else:
-                        print("Unknown family subcommand.")
-                elif parts[0] == 'ask':
-                    query = command[len('ask '):].strip()
-                    self.process_family_query(query)
+                # split(None, 1) breaks on any run of whitespace, as split() does
+                head, tail = (command.split(None, 1) + ['', ''])[:2]
+                if head == 'family':
+                    sub, rest = (tail.split(None, 1) + ['', ''])[:2]
+                    family_handlers.get(sub, self._unknown_family_subcommand)(rest)
+                elif head == 'ask':
+                    self.process_family_query(tail)
                 else:
                     print("Unknown command.")
             except KeyboardInterrupt:
@@ -432,7 +540,8 @@ def main():
     log_level = logging.DEBUG if args.debug else logging.INFO
     logging.basicConfig(
         level=log_level,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        style='%'
     )
     
     # Create Guardian CLI instance
@@ -491,8 +600,14 @@ def main():
     
     args = parser.parse_args()
     
-    # Configure logging
-    logging.basicConfig(level=logging.INFO)
+    # Configure logging (stderr, so it never mixes with MCP frames on stdout)
+    logging.basicConfig(level=logging.INFO, style='%')
+    
+    if args.mcp:
+        # MCP talks JSON-RPC over stdio, so it replaces the interactive CLI
+        # entirely and nothing else may be written to stdout
+        _run_mcp_server()
+        return
     
     print("🛡️ Starting Guardian Node...")
     
@@ -525,15 +640,33 @@ def main():
     print("💻 Running in CLI mode...")
     cli = GuardianCLI()
     
-    if args.mcp:
-        print("🔌 MCP server mode enabled")
-        # MCP integration would go here
-    
     if args.family_mode:
         print("👨‍👩‍👧‍👦 Family mode enabled")
     
     cli.family_cli_loop()
 
+def _run_mcp_server():
+    """Serve the family assistant over MCP on stdio, without building the interactive CLI"""
+    import importlib.util
+    if importlib.util.find_spec('mcp') is None:
+        print("❌ MCP not available. Install with: pip install mcp", file=sys.stderr)
+        sys.exit(1)
+    
+    logger = logging.getLogger('guardian')
+    
+    # Components may print diagnostics while loading; keep them off the
+    # JSON-RPC stream
+    with contextlib.redirect_stdout(sys.stderr):
+        from guardian_interpreter.mcp_server import run_stdio
+        if LLM_AVAILABLE:
+            config = _load_config(logger)
+            family_manager = _create_family_manager(config, logger, AuditLogger(config, logger))
+        else:
+            family_manager = GuardianCLI._create_fallback_manager()
+    
+    logger.info("MCP server mode enabled")
+    run_stdio(family_manager)
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
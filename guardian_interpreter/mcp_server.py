@@ -1,4 +1,3 @@
-<<<<<<< HEAD
 #!/usr/bin/env python3
 """
 Guardian Node MCP Server
@@ -6,10 +5,13 @@ Provides secure MCP interface for Grok/Kiro integration while maintaining privac
 """
 
 import asyncio
+import functools
 import json
 import logging
 import sys
-from typing import Any, Dict, List, Optional
+import threading
+from dataclasses import dataclass, fields
+from typing import Any, Dict, List, Optional, Tuple
 from pathlib import Path
 
 # MCP imports
@@ -26,37 +28,159 @@ try:
     )
     MCP_AVAILABLE = True
 except ImportError:
-    print("Warning: MCP not available. Install with: pip install mcp")
+    # stdout carries the JSON-RPC stream, so diagnostics go to stderr
+    print("Warning: MCP not available. Install with: pip install mcp", file=sys.stderr)
     MCP_AVAILABLE = False
     sys.exit(1)
 
+# Optional fast JSON encoder; falls back to the stdlib json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional libuv-based event loop for lower per-message dispatch overhead
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 # Guardian Node imports
 try:
     from guardian_family_cli_enhanced import EnhancedFamilyManager, FamilySecurityProfile
     from main import GuardianInterpreter
     GUARDIAN_AVAILABLE = True
 except ImportError:
-    print("Warning: Guardian Node components not available")
+    print("Warning: Guardian Node components not available", file=sys.stderr)
     GUARDIAN_AVAILABLE = False
 
+# Slotted dataclasses need Python 3.10; older interpreters keep a __dict__
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# Typed tool arguments, built once per call from the JSON-RPC arguments dict
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
+class AskFamilyQuestionArgs:
+    question: str = ""
+    age_appropriate: bool = True
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
+class RunFamilySkillArgs:
+    skill_name: str = ""
+    args: Tuple[str, ...] = ()
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
+class SecurityRecommendationsArgs:
+    family_size: int = 4
+    has_children: bool = True
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
+class AnalyzeFamilySecurityArgs:
+    include_recommendations: bool = True
+
+@functools.lru_cache(maxsize=None)
+def _arg_names(args_type) -> frozenset:
+    return frozenset(f.name for f in fields(args_type))
+
+def _build_args(args_type, arguments: Optional[Dict[str, Any]]):
+    """Build typed tool arguments, ignoring keys the tool does not declare"""
+    if not arguments:
+        return args_type()
+    names = _arg_names(args_type)
+    return args_type(**{k: v for k, v in arguments.items() if k in names})
+
+class CountingHandler(logging.Handler):
+    """Logging handler that only counts records, for the log summary resource"""
+    
+    def __init__(self):
+        super().__init__()
+        self.count = 0
+    
+    def emit(self, record):
+        self.count += 1
+
+counting_handler = CountingHandler()
+
+def _dumps(obj, pretty=False) -> str:
+    """Serialize obj to JSON text, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0).decode()
+    return json.dumps(obj, indent=2 if pretty else None)
+
+# Icons for recommendation levels. The family models use lowercase levels
+# ("high", "moderate", ...); capitalized forms are accepted as well.
+_PRIORITY_ICON = {"critical": "🔴", "high": "🔴", "medium": "🟡", "low": "🟢"}
+_DIFFICULTY_ICON = {"easy": "🟢", "medium": "🟡", "moderate": "🟡", "hard": "🔴", "advanced": "🔴"}
+_PRIORITY_ICON.update([(level.capitalize(), icon) for level, icon in _PRIORITY_ICON.items()])
+_DIFFICULTY_ICON.update([(level.capitalize(), icon) for level, icon in _DIFFICULTY_ICON.items()])
+_UNKNOWN_ICON = "⚪"
+
+# Largest family_size accepted from clients by get_security_recommendations
+_MAX_FAMILY_SIZE = 20
+
+# Prebuilt responses for when no family manager could be initialized
+_UNAVAILABLE = [TextContent(type="text", text="Family assistant is not available.")]
+_FAMILY_MANAGER_JSON_ERROR = _dumps({"error": "Family manager not available"})
+_ERR_TEMPLATE = "Error executing {name}: {err}"
+
+def _err(msg: str) -> List[TextContent]:
+    """Wrap an error message as a tool result"""
+    return [TextContent(type="text", text=msg)]
+
+@functools.lru_cache(maxsize=64)
+def _unknown_tool(name: str) -> List[TextContent]:
+    # Misbehaving clients tend to repeat the same bad name, so reuse the result
+    return _err(f"Unknown tool: {name}")
+
+_ANALYSIS_PRIVACY_NOTE = TextContent(
+    type="text",
+    text="**Privacy Note:** This analysis was performed completely offline with no external data sharing."
+)
+
+# Placeholder for the one live value in otherwise static JSON payloads
+_COUNTER_SLOT = "__counter__"
+_COUNTER_SLOT_JSON = _dumps(_COUNTER_SLOT)
+
+# One family manager per process, shared by servers built without one
+_FAMILY_MANAGER_SINGLETON = None
+_FAMILY_MANAGER_LOCK = threading.Lock()
+
+def _get_family_manager():
+    """Return the process-wide family manager, creating it on first use"""
+    global _FAMILY_MANAGER_SINGLETON
+    with _FAMILY_MANAGER_LOCK:
+        if _FAMILY_MANAGER_SINGLETON is None:
+            _FAMILY_MANAGER_SINGLETON = EnhancedFamilyManager()
+        return _FAMILY_MANAGER_SINGLETON
+
 class GuardianMCPServer:
     """MCP Server for Guardian Node with privacy-first design"""
     
-    def __init__(self):
+    def __init__(self, family_manager=None):
         self.server = Server("guardian-node")
-        self.family_manager = None
-        self.guardian = None
+        self.family_manager = family_manager
         self.privacy_mode = True
         self.child_safe_mode = True
         
-        # Setup logging
-        logging.basicConfig(level=logging.INFO)
+        # Setup logging (root configuration is left to the entry point)
         self.logger = logging.getLogger("guardian-mcp")
+        if counting_handler not in self.logger.handlers:
+            self.logger.addHandler(counting_handler)
+        
+        # Initialize Guardian components unless the caller shares its own
+        if self.family_manager is None:
+            self._initialize_guardian()
+        
+        # Profiles handed to the family manager are read-only, so build them once
+        self._default_profile = self._new_profile()
+        self._profile_for = functools.lru_cache(maxsize=32)(self._build_profile)
         
-        # Initialize Guardian components
-        self._initialize_guardian()
+        # Recommendations only depend on the family shape and the manager's
+        # data, so memoize them keyed on the manager's data version
+        self._family_recs_json = (None, None)
+        self._recommendations_text = functools.lru_cache(maxsize=32)(self._build_recommendations_text)
         
-        # Register MCP handlers
+        # Precompute static payloads, then register MCP handlers
+        self._build_static_payloads()
         self._register_handlers()
     
     def _initialize_guardian(self):
@@ -64,242 +188,269 @@ class GuardianMCPServer:
         try:
             if GUARDIAN_AVAILABLE:
                 # Initialize family manager
-                self.family_manager = EnhancedFamilyManager()
-                
-                # Initialize Guardian interpreter (without full startup)
-                self.guardian = GuardianInterpreter()
+                self.family_manager = _get_family_manager()
                 
                 self.logger.info("Guardian Node components initialized for MCP")
             else:
                 self.logger.warning("Guardian Node components not available")
         except Exception as e:
-            self.logger.error(f"Failed to initialize Guardian components: {e}")
+            self.logger.error("Failed to initialize Guardian components: %s", e)
+    
+    @functools.cached_property
+    def guardian(self):
+        """Guardian interpreter, constructed on first use since no handler needs it yet"""
+        if not GUARDIAN_AVAILABLE:
+            return None
+        return GuardianInterpreter()
+    
+    def _build_static_payloads(self):
+        """Build resource/tool listings and JSON bodies that never change per request"""
+        self._resources_list = [
+            Resource(
+                uri="guardian://status",
+                name="Guardian Node Status",
+                description="Current status and health of Guardian Node",
+                mimeType="application/json"
+            ),
+            Resource(
+                uri="guardian://family/skills",
+                name="Family Cybersecurity Skills",
+                description="Available family cybersecurity skills and tools",
+                mimeType="application/json"
+            ),
+            Resource(
+                uri="guardian://family/recommendations",
+                name="Family Security Recommendations",
+                description="Personalized security recommendations for families",
+                mimeType="application/json"
+            ),
+            Resource(
+                uri="guardian://logs/summary",
+                name="Security Log Summary",
+                description="Summary of recent security events (privacy-filtered)",
+                mimeType="application/json"
+            )
+        ]
+        
+        self._tools_list = [
+            Tool(
+                name="ask_family_question",
+                description="Ask a family cybersecurity question and get educational response",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "question": {
+                            "type": "string",
+                            "description": "Family cybersecurity question"
+                        },
+                        "age_appropriate": {
+                            "type": "boolean",
+                            "description": "Ensure response is child-safe",
+                            "default": True
+                        }
+                    },
+                    "required": ["question"]
+                }
+            ),
+            Tool(
+                name="run_family_skill",
+                description="Execute a family cybersecurity skill",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "skill_name": {
+                            "type": "string",
+                            "description": "Name of the skill to run",
+                            "enum": [
+                                "threat_analysis",
+                                "password_check",
+                                "device_scan",
+                                "parental_control_check",
+                                "phishing_education",
+                                "network_security_audit"
+                            ]
+                        },
+                        "args": {
+                            "type": "array",
+                            "description": "Arguments for the skill",
+                            "items": {"type": "string"},
+                            "default": []
+                        }
+                    },
+                    "required": ["skill_name"]
+                }
+            ),
+            Tool(
+                name="get_security_recommendations",
+                description="Get personalized family security recommendations",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "family_size": {
+                            "type": "integer",
+                            "description": "Number of family members",
+                            "default": 4
+                        },
+                        "has_children": {
+                            "type": "boolean",
+                            "description": "Whether family has children",
+                            "default": True
+                        }
+                    }
+                }
+            ),
+            Tool(
+                name="analyze_family_security",
+                description="Perform comprehensive family security analysis",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "include_recommendations": {
+                            "type": "boolean",
+                            "description": "Include security recommendations",
+                            "default": True
+                        }
+                    }
+                }
+            )
+        ]
+        
+        # Status and log summary are static apart from one counter each, so
+        # serialize them once and splice the live value in on each read
+        status = {
+            "guardian_node": {
+                "status": "running",
+                "privacy_mode": self.privacy_mode,
+                "child_safe_mode": self.child_safe_mode,
+                "family_assistant": self.family_manager is not None,
+                "skills_available": _COUNTER_SLOT,
+                "offline_mode": True
+            },
+            "capabilities": [
+                "family_cybersecurity_education",
+                "threat_analysis",
+                "password_security",
+                "device_scanning",
+                "parental_controls",
+                "phishing_education",
+                "network_security"
+            ],
+            "privacy_features": [
+                "no_external_calls",
+                "local_processing_only",
+                "comprehensive_audit_logging",
+                "child_safe_responses"
+            ]
+        }
+        self._status_head, _, self._status_tail = _dumps(status, pretty=True).partition(_COUNTER_SLOT_JSON)
+        
+        summary = {
+            "recent_activity": {
+                "family_questions_answered": "Available",
+                "security_skills_executed": "Available",
+                "threat_analyses_performed": "Available",
+                "blocked_external_calls": "Privacy protected - no external calls made"
+            },
+            "privacy_status": {
+                "external_calls_blocked": True,
+                "data_stays_local": True,
+                "audit_logging_active": True
+            },
+            "events": _COUNTER_SLOT,
+            "note": "Detailed logs are kept private and only accessible locally for security audit purposes"
+        }
+        self._log_summary_head, _, self._log_summary_tail = _dumps(summary, pretty=True).partition(_COUNTER_SLOT_JSON)
     
     def _register_handlers(self):
         """Register MCP request handlers"""
+        self._resource_handlers = {
+            "guardian://status": self._get_guardian_status,
+            "guardian://family/skills": self._get_family_skills,
+            "guardian://family/recommendations": self._get_family_recommendations,
+            "guardian://logs/summary": self._get_log_summary
+        }
+        self._tool_handlers = {
+            "ask_family_question": (AskFamilyQuestionArgs, self._ask_family_question),
+            "run_family_skill": (RunFamilySkillArgs, self._run_family_skill),
+            "get_security_recommendations": (SecurityRecommendationsArgs, self._get_security_recommendations),
+            "analyze_family_security": (AnalyzeFamilySecurityArgs, self._analyze_family_security)
+        }
         
         @self.server.list_resources()
         async def handle_list_resources() -> List[Resource]:
             """List available Guardian Node resources"""
-            resources = [
-                Resource(
-                    uri="guardian://status",
-                    name="Guardian Node Status",
-                    description="Current status and health of Guardian Node",
-                    mimeType="application/json"
-                ),
-                Resource(
-                    uri="guardian://family/skills",
-                    name="Family Cybersecurity Skills",
-                    description="Available family cybersecurity skills and tools",
-                    mimeType="application/json"
-                ),
-                Resource(
-                    uri="guardian://family/recommendations",
-                    name="Family Security Recommendations",
-                    description="Personalized security recommendations for families",
-                    mimeType="application/json"
-                ),
-                Resource(
-                    uri="guardian://logs/summary",
-                    name="Security Log Summary",
-                    description="Summary of recent security events (privacy-filtered)",
-                    mimeType="application/json"
-                )
-            ]
-            return resources
+            return self._resources_list
         
         @self.server.read_resource()
         async def handle_read_resource(uri: str) -> str:
             """Read Guardian Node resource content"""
             try:
-                if uri == "guardian://status":
-                    return await self._get_guardian_status()
-                elif uri == "guardian://family/skills":
-                    return await self._get_family_skills()
-                elif uri == "guardian://family/recommendations":
-                    return await self._get_family_recommendations()
-                elif uri == "guardian://logs/summary":
-                    return await self._get_log_summary()
-                else:
-                    return json.dumps({"error": "Resource not found", "uri": uri})
+                handler = self._resource_handlers.get(uri)
+                if handler is None:
+                    return _dumps({"error": "Resource not found", "uri": uri})
+                return await handler()
             except Exception as e:
-                self.logger.error(f"Error reading resource {uri}: {e}")
-                return json.dumps({"error": str(e)})
+                self.logger.error("Error reading resource %s: %s", uri, e)
+                return _dumps({"error": str(e)})
         
         @self.server.list_tools()
         async def handle_list_tools() -> List[Tool]:
             """List available Guardian Node tools"""
-            tools = [
-                Tool(
-                    name="ask_family_question",
-                    description="Ask a family cybersecurity question and get educational response",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "question": {
-                                "type": "string",
-                                "description": "Family cybersecurity question"
-                            },
-                            "age_appropriate": {
-                                "type": "boolean",
-                                "description": "Ensure response is child-safe",
-                                "default": True
-                            }
-                        },
-                        "required": ["question"]
-                    }
-                ),
-                Tool(
-                    name="run_family_skill",
-                    description="Execute a family cybersecurity skill",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "skill_name": {
-                                "type": "string",
-                                "description": "Name of the skill to run",
-                                "enum": [
-                                    "threat_analysis",
-                                    "password_check",
-                                    "device_scan",
-                                    "parental_control_check",
-                                    "phishing_education",
-                                    "network_security_audit"
-                                ]
-                            },
-                            "args": {
-                                "type": "array",
-                                "description": "Arguments for the skill",
-                                "items": {"type": "string"},
-                                "default": []
-                            }
-                        },
-                        "required": ["skill_name"]
-                    }
-                ),
-                Tool(
-                    name="get_security_recommendations",
-                    description="Get personalized family security recommendations",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "family_size": {
-                                "type": "integer",
-                                "description": "Number of family members",
-                                "default": 4
-                            },
-                            "has_children": {
-                                "type": "boolean",
-                                "description": "Whether family has children",
-                                "default": True
-                            }
-                        }
-                    }
-                ),
-                Tool(
-                    name="analyze_family_security",
-                    description="Perform comprehensive family security analysis",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "include_recommendations": {
-                                "type": "boolean",
-                                "description": "Include security recommendations",
-                                "default": True
-                            }
-                        }
-                    }
-                )
-            ]
-            return tools
+            return self._tools_list
         
         @self.server.call_tool()
         async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
             """Handle tool execution requests"""
             try:
-                if name == "ask_family_question":
-                    return await self._ask_family_question(arguments)
-                elif name == "run_family_skill":
-                    return await self._run_family_skill(arguments)
-                elif name == "get_security_recommendations":
-                    return await self._get_security_recommendations(arguments)
-                elif name == "analyze_family_security":
-                    return await self._analyze_family_security(arguments)
-                else:
-                    return [TextContent(
-                        type="text",
-                        text=f"Unknown tool: {name}"
-                    )]
+                entry = self._tool_handlers.get(name)
+                if entry is None:
+                    return _unknown_tool(name)
+                # Undeclared argument names are dropped, as before typed args
+                args_type, handler = entry
+                return await handler(_build_args(args_type, arguments))
             except Exception as e:
-                self.logger.error(f"Error executing tool {name}: {e}")
-                return [TextContent(
-                    type="text",
-                    text=f"Error executing {name}: {str(e)}"
-                )]
+                self.logger.error("Error executing tool %s: %s", name, e)
+                return _err(_ERR_TEMPLATE.format(name=name, err=e))
     
     async def _get_guardian_status(self) -> str:
         """Get Guardian Node status"""
-        try:
-            status = {
-                "guardian_node": {
-                    "status": "running",
-                    "privacy_mode": self.privacy_mode,
-                    "child_safe_mode": self.child_safe_mode,
-                    "family_assistant": self.family_manager is not None,
-                    "skills_available": len(self.family_manager.family_skills) if self.family_manager else 0,
-                    "offline_mode": True
-                },
-                "capabilities": [
-                    "family_cybersecurity_education",
-                    "threat_analysis",
-                    "password_security",
-                    "device_scanning",
-                    "parental_controls",
-                    "phishing_education",
-                    "network_security"
-                ],
-                "privacy_features": [
-                    "no_external_calls",
-                    "local_processing_only",
-                    "comprehensive_audit_logging",
-                    "child_safe_responses"
-                ]
-            }
-            return json.dumps(status, indent=2)
-        except Exception as e:
-            return json.dumps({"error": str(e)})
+        skills_available = len(self.family_manager.family_skills) if self.family_manager else 0
+        return f"{self._status_head}{skills_available}{self._status_tail}"
     
     async def _get_family_skills(self) -> str:
         """Get available family skills"""
-        try:
-            if not self.family_manager:
-                return json.dumps({"error": "Family manager not available"})
-            
-            skills = []
-            for skill_name, description in self.family_manager.skill_descriptions.items():
-                skills.append({
-                    "name": skill_name,
-                    "description": description,
-                    "family_friendly": True,
-                    "child_safe": True
-                })
-            
-            return json.dumps({
-                "family_skills": skills,
-                "total_skills": len(skills)
-            }, indent=2)
-        except Exception as e:
-            return json.dumps({"error": str(e)})
+        if self.family_manager is None:
+            return _FAMILY_MANAGER_JSON_ERROR
+        
+        # FamilyAssistantManager has no per-skill descriptions
+        descriptions = getattr(self.family_manager, 'skill_descriptions', None) or dict.fromkeys(
+            self.family_manager.family_skills, "Family cybersecurity skill"
+        )
+        skills = []
+        for skill_name, description in descriptions.items():
+            skills.append({
+                "name": skill_name,
+                "description": description,
+                "family_friendly": True,
+                "child_safe": True
+            })
+        
+        return _dumps({
+            "family_skills": skills,
+            "total_skills": len(skills)
+        }, pretty=True)
     
     async def _get_family_recommendations(self) -> str:
         """Get family security recommendations"""
-        try:
-            if not self.family_manager:
-                return json.dumps({"error": "Family manager not available"})
-            
-            profile = FamilySecurityProfile()
-            recommendations = self.family_manager.get_family_recommendations(profile)
+        if self.family_manager is None:
+            return _FAMILY_MANAGER_JSON_ERROR
+        
+        version = self._data_version()
+        cached_version, cached_json = self._family_recs_json
+        if cached_json is None or cached_version != version:
+            recommendations = await asyncio.to_thread(
+                self.family_manager.get_family_recommendations, self._default_profile
+            )
             
             rec_list = []
             for rec in recommendations:
@@ -311,211 +462,186 @@ class GuardianMCPServer:
                     "category": getattr(rec, 'category', 'general')
                 })
             
-            return json.dumps({
+            cached_json = _dumps({
                 "recommendations": rec_list,
                 "total_recommendations": len(rec_list),
                 "generated_for": "family_security"
-            }, indent=2)
-        except Exception as e:
-            return json.dumps({"error": str(e)})
+            }, pretty=True)
+            self._family_recs_json = (version, cached_json)
+        return cached_json
+    
+    def _data_version(self):
+        """Version of the family manager's data; memoized recommendations are keyed on it"""
+        return (id(self.family_manager), getattr(self.family_manager, 'data_version', None))
+    
+    def invalidate_recommendations(self):
+        """Drop memoized recommendations so the next request recomputes them"""
+        self._family_recs_json = (None, None)
+        self._recommendations_text.cache_clear()
     
     async def _get_log_summary(self) -> str:
         """Get privacy-filtered log summary"""
-        try:
-            # Return only non-sensitive log summary
-            summary = {
-                "recent_activity": {
-                    "family_questions_answered": "Available",
-                    "security_skills_executed": "Available",
-                    "threat_analyses_performed": "Available",
-                    "blocked_external_calls": "Privacy protected - no external calls made"
-                },
-                "privacy_status": {
-                    "external_calls_blocked": True,
-                    "data_stays_local": True,
-                    "audit_logging_active": True
-                },
-                "note": "Detailed logs are kept private and only accessible locally for security audit purposes"
-            }
-            return json.dumps(summary, indent=2)
-        except Exception as e:
-            return json.dumps({"error": str(e)})
+        # Return only non-sensitive log summary
+        return f"{self._log_summary_head}{counting_handler.count}{self._log_summary_tail}"
     
-    async def _ask_family_question(self, arguments: Dict[str, Any]) -> List[TextContent]:
+    async def _ask_family_question(self, arguments: AskFamilyQuestionArgs) -> List[TextContent]:
         """Handle family cybersecurity questions"""
-        try:
-            question = arguments.get("question", "")
-            age_appropriate = arguments.get("age_appropriate", True)
-            
-            if not self.family_manager:
-                return [TextContent(
-                    type="text",
-                    text="Family assistant is not available. Please check Guardian Node configuration."
-                )]
-            
-            # Process the question
-            context = {
-                "family_profile": {
-                    "family_id": "mcp_session",
-                    "child_safe_mode": age_appropriate and self.child_safe_mode
-                }
+        if self.family_manager is None:
+            return _UNAVAILABLE
+        
+        # Process the question
+        context = {
+            "family_profile": {
+                "family_id": "mcp_session",
+                "child_safe_mode": arguments.age_appropriate and self.child_safe_mode
             }
-            
-            result = self.family_manager.process_family_query(question, context)
-            
-            response_text = f"**Family Cybersecurity Assistant Response:**\n\n"
-            response_text += f"{result.get('response', 'No response available')}\n\n"
-            
-            confidence = result.get('confidence', 0)
-            if confidence > 0:
-                response_text += f"**Confidence:** {confidence:.0%}\n\n"
-            
-            follow_ups = result.get('follow_up_questions', [])
-            if follow_ups:
-                response_text += "**Follow-up questions you might ask:**\n"
-                for i, q in enumerate(follow_ups[:3], 1):
-                    response_text += f"{i}. {q}\n"
-            
-            return [TextContent(type="text", text=response_text)]
-            
-        except Exception as e:
-            return [TextContent(
-                type="text",
-                text=f"Error processing family question: {str(e)}"
-            )]
+        }
+        
+        # Family manager calls block, so run them off the event loop
+        result = await asyncio.to_thread(self.family_manager.process_family_query, arguments.question, context)
+        
+        parts = [
+            "**Family Cybersecurity Assistant Response:**\n\n",
+            f"{result.get('response', 'No response available')}\n\n"
+        ]
+        
+        confidence = result.get('confidence', 0)
+        if confidence > 0:
+            parts.append(f"**Confidence:** {confidence:.0%}\n\n")
+        
+        follow_ups = result.get('follow_up_questions', [])
+        if follow_ups:
+            parts.append("**Follow-up questions you might ask:**\n")
+            parts.append("\n".join(f"{i}. {q}" for i, q in enumerate(follow_ups[:3], 1)))
+            parts.append("\n")
+        
+        return [TextContent(type="text", text="".join(parts))]
     
-    async def _run_family_skill(self, arguments: Dict[str, Any]) -> List[TextContent]:
+    async def _run_family_skill(self, arguments: RunFamilySkillArgs) -> List[TextContent]:
         """Execute a family cybersecurity skill"""
-        try:
-            skill_name = arguments.get("skill_name", "")
-            args = arguments.get("args", [])
-            
-            if not self.family_manager:
-                return [TextContent(
-                    type="text",
-                    text="Family assistant is not available."
-                )]
+        if self.family_manager is None:
+            return _UNAVAILABLE
+        
+        skill_name = arguments.skill_name
+        
+        result = await asyncio.to_thread(self.family_manager.run_family_skill, skill_name, *arguments.args)
+        
+        if result.get('success'):
+            parts = [
+                f"**Family Skill: {skill_name}**\n\n",
+                f"✅ **Result:** {result.get('result', 'Completed successfully')}\n\n"
+            ]
             
-            result = self.family_manager.run_family_skill(skill_name, *args)
+            details = result.get('details', {})
+            if details:
+                parts.append("**Details:**\n")
+                parts.append("\n".join(
+                    f"- {key}: {', '.join(map(str, value)) if isinstance(value, list) else value}"
+                    for key, value in details.items()
+                ))
+                parts.append("\n")
             
-            if result.get('success'):
-                response_text = f"**Family Skill: {skill_name}**\n\n"
-                response_text += f"✅ **Result:** {result.get('result', 'Completed successfully')}\n\n"
-                
-                details = result.get('details', {})
-                if details:
-                    response_text += "**Details:**\n"
-                    for key, value in details.items():
-                        if isinstance(value, list):
-                            response_text += f"- {key}: {', '.join(map(str, value))}\n"
-                        else:
-                            response_text += f"- {key}: {value}\n"
-                
-                return [TextContent(type="text", text=response_text)]
-            else:
-                error_msg = result.get('error', 'Unknown error')
-                return [TextContent(
-                    type="text",
-                    text=f"❌ **Family skill '{skill_name}' failed:** {error_msg}"
-                )]
-                
-        except Exception as e:
-            return [TextContent(
-                type="text",
-                text=f"Error executing family skill: {str(e)}"
-            )]
+            return [TextContent(type="text", text="".join(parts))]
+        else:
+            error_msg = result.get('error', 'Unknown error')
+            return _err(f"❌ **Family skill '{skill_name}' failed:** {error_msg}")
     
-    async def _get_security_recommendations(self, arguments: Dict[str, Any]) -> List[TextContent]:
-        """Get personalized security recommendations"""
-        try:
-            family_size = arguments.get("family_size", 4)
-            has_children = arguments.get("has_children", True)
-            
-            if not self.family_manager:
-                return [TextContent(
-                    type="text",
-                    text="Family assistant is not available."
-                )]
-            
-            # Create family profile
+    @staticmethod
+    def _new_profile(members=None):
+        """Create a family profile; a plain dict when FamilySecurityProfile isn't importable"""
+        if GUARDIAN_AVAILABLE:
             profile = FamilySecurityProfile()
-            profile.members = [{"role": "parent"}] * max(1, family_size - (2 if has_children else 0))
-            if has_children:
-                profile.members.extend([{"role": "child", "age_group": "minor"}] * 2)
-            
-            recommendations = self.family_manager.get_family_recommendations(profile)
-            
-            response_text = "**🛡️ Family Security Recommendations**\n\n"
-            
-            for i, rec in enumerate(recommendations, 1):
-                priority_icon = "🔴" if rec.priority == 'High' else "🟡" if rec.priority == 'Medium' else "🟢"
-                difficulty_icon = "🟢" if rec.difficulty == 'Easy' else "🟡" if rec.difficulty == 'Medium' else "🔴"
-                
-                response_text += f"**{i}. {rec.title}**\n"
-                response_text += f"Priority: {priority_icon} {rec.priority} | Difficulty: {difficulty_icon} {rec.difficulty}\n"
-                response_text += f"{rec.description}\n\n"
-            
-            return [TextContent(type="text", text=response_text)]
-            
-        except Exception as e:
-            return [TextContent(
-                type="text",
-                text=f"Error getting security recommendations: {str(e)}"
-            )]
+            if members is not None:
+                profile.members = members
+            return profile
+        # FamilyAssistantManager accepts dict profiles
+        return {"family_id": "mcp_session", "members": members or [], "devices": []}
     
-    async def _analyze_family_security(self, arguments: Dict[str, Any]) -> List[TextContent]:
-        """Perform family security analysis"""
-        try:
-            include_recommendations = arguments.get("include_recommendations", True)
-            
-            if not self.family_manager:
-                return [TextContent(
-                    type="text",
-                    text="Family assistant is not available."
-                )]
-            
-            profile = FamilySecurityProfile()
-            analysis = self.family_manager.analyze_family_security(profile)
-            
-            response_text = "**🔍 Family Security Analysis Report**\n\n"
-            response_text += f"**Status:** {analysis.status}\n"
-            response_text += f"**Overall Score:** {analysis.overall_score:.1f}/100\n\n"
-            
-            if hasattr(analysis, 'findings') and analysis.findings:
-                response_text += "**🔍 Security Findings:**\n"
-                for finding in analysis.findings:
-                    response_text += f"✅ {finding}\n"
-                response_text += "\n"
-            
-            if include_recommendations and hasattr(analysis, 'recommendations') and analysis.recommendations:
-                response_text += "**💡 Priority Recommendations:**\n"
-                for i, rec in enumerate(analysis.recommendations[:5], 1):
-                    priority_icon = "🔴" if rec.priority == 'High' else "🟡" if rec.priority == 'Medium' else "🟢"
-                    response_text += f"{i}. {priority_icon} {rec.title} (Priority: {rec.priority})\n"
-                    if rec.description:
-                        response_text += f"   {rec.description}\n"
-                response_text += "\n"
-            
-            response_text += "**Privacy Note:** This analysis was performed completely offline with no external data sharing."
-            
-            return [TextContent(type="text", text=response_text)]
+    def _build_profile(self, family_size: int, has_children: bool):
+        """Build a profile for a family of the given shape (memoized as _profile_for)"""
+        members = [{"role": "parent"}] * max(1, family_size - (2 if has_children else 0))
+        if has_children:
+            members.extend([{"role": "child", "age_group": "minor"}] * 2)
+        return self._new_profile(members)
+    
+    def _build_recommendations_text(self, version, family_size: int, has_children: bool) -> str:
+        """Format recommendations for a family of the given shape (version only keys the memo)"""
+        profile = self._profile_for(family_size, has_children)
+        recommendations = self.family_manager.get_family_recommendations(profile)
+        
+        parts = ["**🛡️ Family Security Recommendations**\n\n"]
+        
+        for i, rec in enumerate(recommendations, 1):
+            priority_icon = _PRIORITY_ICON.get(rec.priority, _UNKNOWN_ICON)
+            difficulty_icon = _DIFFICULTY_ICON.get(rec.difficulty, _UNKNOWN_ICON)
             
-        except Exception as e:
-            return [TextContent(
-                type="text",
-                text=f"Error performing security analysis: {str(e)}"
-            )]
-
-async def main():
-    """Main MCP server entry point"""
-    if not MCP_AVAILABLE:
-        print("MCP not available. Please install: pip install mcp")
-        sys.exit(1)
+            parts.append(f"**{i}. {rec.title}**\n")
+            parts.append(f"Priority: {priority_icon} {rec.priority} | Difficulty: {difficulty_icon} {rec.difficulty}\n")
+            parts.append(f"{rec.description}\n\n")
+        
+        return "".join(parts)
     
-    # Create Guardian MCP server
-    guardian_server = GuardianMCPServer()
+    async def _get_security_recommendations(self, arguments: SecurityRecommendationsArgs) -> List[TextContent]:
+        """Get personalized security recommendations"""
+        if self.family_manager is None:
+            return _UNAVAILABLE
+        
+        # family_size comes from the client; clamp it so the memo caches
+        # only ever see a small set of keys
+        family_size = min(max(int(arguments.family_size), 1), _MAX_FAMILY_SIZE)
+        response_text = await asyncio.to_thread(
+            self._recommendations_text, self._data_version(), family_size, bool(arguments.has_children)
+        )
+        return [TextContent(type="text", text=response_text)]
     
-    # Run the server
+    async def _analyze_family_security(self, arguments: AnalyzeFamilySecurityArgs) -> List[TextContent]:
+        """Perform family security analysis"""
+        if self.family_manager is None:
+            return _UNAVAILABLE
+        
+        analysis = await asyncio.to_thread(self.family_manager.analyze_family_security, self._default_profile)
+        
+        # Return the report as separate content items rather than one large string
+        header = (
+            "**🔍 Family Security Analysis Report**\n\n"
+            f"**Status:** {analysis.status}\n"
+            f"**Overall Score:** {analysis.overall_score:.1f}/100\n\n"
+        )
+        content = [TextContent(type="text", text=header)]
+        
+        if hasattr(analysis, 'findings') and analysis.findings:
+            findings_block = "".join([
+                "**🔍 Security Findings:**\n",
+                *(f"✅ {finding}\n" for finding in analysis.findings),
+                "\n"
+            ])
+            content.append(TextContent(type="text", text=findings_block))
+        
+        if arguments.include_recommendations and hasattr(analysis, 'recommendations') and analysis.recommendations:
+            recs = ["**💡 Priority Recommendations:**\n"]
+            for i, rec in enumerate(analysis.recommendations[:5], 1):
+                priority_icon = _PRIORITY_ICON.get(rec.priority, _UNKNOWN_ICON)
+                recs.append(f"{i}. {priority_icon} {rec.title} (Priority: {rec.priority})\n")
+                if rec.description:
+                    recs.append(f"   {rec.description}\n")
+            recs.append("\n")
+            content.append(TextContent(type="text", text="".join(recs)))
+        
+        content.append(_ANALYSIS_PRIVACY_NOTE)
+        return content
+
+def run(coro):
+    """Run coro to completion, on a uvloop event loop when uvloop is installed"""
+    if uvloop is not None:
+        return uvloop.run(coro)
+    return asyncio.run(coro)
+
+def build_server(family_manager=None) -> GuardianMCPServer:
+    """Create the MCP server, reusing an existing family manager if given"""
+    return GuardianMCPServer(family_manager)
+
+async def serve(guardian_server: GuardianMCPServer):
+    """Run a Guardian MCP server over stdio"""
     async with stdio_server() as (read_stream, write_stream):
         await guardian_server.server.run(
             read_stream,
@@ -531,57 +657,19 @@ async def main():
             )
         )
 
-if __name__ == "__main__":
-    asyncio.run(main())
-=======
-# guardian_interpreter/mcp_server.py
-from mcp import Server  # Assumes offline wheel installed (pip install mcp-agent.whl --no-deps)
-from family_assistant import process_query, execute_skill, get_recommendations, analyze_security
-from family_assistant.manager import FamilyAssistantManager
-import logging
-
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
-
-server = Server("guardian-node")
-fm = FamilyAssistantManager()
-
-@server.tool
-def ask_family_question(query):
-    logger.info(f"Processing query: {query}")
-    return fm.process_query(query, child_safe=True, offline=True)
-
-@server.tool
-def run_family_skill(skill_name, *args):
-    logger.info(f"Executing skill: {skill_name}")
-    return fm.execute_skill(skill_name, *args)
+def run_stdio(family_manager=None):
+    """Serve a Guardian MCP server over stdio until the client disconnects"""
+    run(serve(build_server(family_manager)))
 
-@server.tool
-def get_security_recommendations():
-    logger.info("Fetching security recommendations")
-    return fm.get_recommendations()
-
-@server.tool
-def analyze_family_security():
-    logger.info("Analyzing family security")
-    return fm.analyze_security()
-
-@server.resource
-def guardian_status():
-    return {"health": "ok", "offline": True, "capabilities": ["family_assistant", "mcp_tools"]}
-
-@server.resource
-def family_skills():
-    return fm.list_skills()
-
-@server.resource
-def security_recommendations():
-    return fm.get_recommendations()
-
-@server.resource
-def log_summary():
-    return {"summary": "Privacy-filtered activity log", "events": len(logger.handlers[0].records)}  # Mock
+async def main():
+    """Main MCP server entry point"""
+    if not MCP_AVAILABLE:
+        print("MCP not available. Please install: pip install mcp", file=sys.stderr)
+        sys.exit(1)
+    
+    # Create and run Guardian MCP server
+    await serve(build_server())
 
 if __name__ == "__main__":
-    server.run(host="localhost", port=8080, privacy_mode="strict", child_safe=True)
->>>>>>> a0d2c75a88747ce742b9ef6cc664642fcb07ac5e
+    logging.basicConfig(level=logging.INFO)
+    run(main())
@@ -5,14 +5,302 @@ Ensures privacy-first operation with comprehensive security controls.
 """
 
 import socket
+import queue
+import re
 import urllib.parse
 import logging
+import logging.handlers
 import time
 import os
 import json
+import itertools
+from collections import Counter, OrderedDict, defaultdict, deque
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, NamedTuple, Optional, Tuple
 import threading
+import weakref
+
+# psutil is optional; without it the interface part of the connectivity check is skipped
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# Optional fast JSON codec for the family audit log; falls back to the stdlib json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Maximum audit or family records coalesced into one write
+_AUDIT_BATCH_SIZE = 256
+
+# Seconds a connectivity check result stays valid
+_CONNECTIVITY_CACHE_TTL = 30
+
+# Most recent family audit records kept in memory per family
+_FAMILY_RECORDS_PER_FAMILY = 10000
+
+# Keys containing any of these names are redacted from family audit records;
+# matched in one regex search per key
+_SENSITIVE_FIELDS = (
+    "password", "token", "secret", "ssn", "social_security",
+    "credit_card", "bank_account", "api_key", "private_key",
+    "email", "phone", "address", "full_name", "real_name"
+)
+_SENSITIVE_FIELD_RE = re.compile('|'.join(map(re.escape, _SENSITIVE_FIELDS)))
+
+# Maximum hosts whose allow/deny verdict is remembered
+_DECISION_CACHE_SIZE = 4096
+
+# Allowlists with at least this many domains are matched through the label
+# trie; shorter ones are faster with a single str.endswith call
+_TRIE_MIN_DOMAINS = 32
+
+# URL schemes that never leave the process, rejected without parsing
+_NON_NETWORK_SCHEMES = frozenset(('data:', 'blob:'))
+
+# Route flag for entries that go via a gateway (linux/route.h)
+_RTF_GATEWAY = 0x2
+
+# Wall-clock anchor for history entries, which record monotonic_ns() readings
+_T0_WALL = time.time()
+_T0_MONO_NS = time.monotonic_ns()
+
+class BlockedEntry(NamedTuple):
+    """A blocked outbound request"""
+    mono_ns: int
+    url: str
+    method: str
+    reason: str
+
+class AllowedEntry(NamedTuple):
+    """An allowed outbound request"""
+    mono_ns: int
+    url: str
+    method: str
+
+class AuditEntry(NamedTuple):
+    """An audit event"""
+    mono_ns: int
+    category: str
+    event: str
+    details: Dict[str, Any]
+
+def _as_dicts(entries) -> List[Dict[str, Any]]:
+    """Convert history entries to plain dicts with wall-clock timestamps for API callers"""
+    results = []
+    for entry in entries:
+        fields = entry._asdict()
+        timestamp = _T0_WALL + (fields.pop('mono_ns') - _T0_MONO_NS) / 1e9
+        results.append({'timestamp': timestamp, **fields})
+    return results
+
+def _recent(events: deque, limit: int) -> list:
+    """Return the last `limit` entries of a deque, oldest first"""
+    recent = list(itertools.islice(reversed(events), limit))
+    recent.reverse()
+    return recent
+
+def _tail(events: deque, limit: int) -> List[Dict[str, Any]]:
+    """Return the last `limit` entries of a deque as dicts, oldest first"""
+    return _as_dicts(_recent(events, limit))
+
+def _json_line(record: Dict[str, Any]) -> bytes:
+    """Serialize a family audit record as one UTF-8 JSON line"""
+    if orjson is not None:
+        return orjson.dumps(record, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(record, ensure_ascii=False) + "\n").encode('utf-8')
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+def _write_all(fd: int, data: bytes):
+    """Write bytes to a file descriptor, retrying short writes"""
+    data = memoryview(data)
+    while data:
+        data = data[os.write(fd, data):]
+
+def _copy_connectivity(results: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy a cached connectivity result so callers can't modify the cache"""
+    return {**results, 'interfaces': [dict(iface) for iface in results['interfaces']]}
+
+def _has_default_gateway(route_table: str = '/proc/net/route') -> bool:
+    """Check the kernel routing table for a default route via a gateway"""
+    with open(route_table, 'r') as f:
+        next(f, None)  # Skip header
+        for line in f:
+            fields = line.split()
+            if len(fields) < 4:
+                continue
+            if fields[1] == '00000000' and int(fields[3], 16) & _RTF_GATEWAY:
+                return True
+    return False
+
+def _normalize_domain(domain: str) -> str:
+    """Canonical form for domain comparisons: trimmed, lowercase, no trailing dot"""
+    domain = domain.strip().rstrip('.')
+    return domain if domain.islower() else domain.lower()
+
+def _url_host(url: str) -> str:
+    """Return the lowercased host of a URL, without userinfo or port"""
+    # Fast path for plain scheme://host URLs using only str.find and slicing;
+    # anything unusual (IPv6 literals, odd schemes, escapes, whitespace) goes
+    # through urlsplit so the result always matches the stdlib parse
+    sep = url.find('://')
+    if sep > 0 and url[:sep].isalpha():
+        start = sep + 3
+        end = len(url)
+        for delim in '/?#':
+            i = url.find(delim, start, end)
+            if i >= 0:
+                end = i
+        host = url[start:end].rpartition('@')[2].partition(':')[0]
+        if host.isascii() and host.isprintable() and '[' not in host and ' ' not in host and '\\' not in host:
+            if not host.islower():
+                host = host.lower()
+            return host.rstrip('.')
+    
+    return (urllib.parse.urlsplit(url).hostname or '').rstrip('.')
+
+class _BatchedFileHandler(logging.Handler):
+    """Append records to a held O_APPEND descriptor, coalescing them while the queue has a backlog"""
+    
+    def __init__(self, path: str, pending: queue.SimpleQueue):
+        super().__init__()
+        self._fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self._pending = pending
+        self._buffer = bytearray()
+        self._batched = 0
+    
+    def encode(self, record: logging.LogRecord) -> bytes:
+        return (self.format(record) + '\n').encode('utf-8')
+    
+    def emit(self, record: logging.LogRecord):
+        # A flush request queued by _LogWriter.flush(): write what is buffered
+        flushed = getattr(record, 'flushed', None)
+        if flushed is not None:
+            self.flush()
+            flushed.set()
+            return
+        
+        try:
+            self._buffer += self.encode(record)
+            self._batched += 1
+            if self._batched >= _AUDIT_BATCH_SIZE or self._pending.empty():
+                self.flush()
+        except Exception:
+            self.handleError(record)
+    
+    def flush(self):
+        with self.lock:
+            if self._buffer and self._fd is not None:
+                _write_all(self._fd, self._buffer)
+            self._buffer.clear()
+            self._batched = 0
+    
+    def close(self):
+        with self.lock:
+            self.flush()
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+        super().close()
+
+class _FamilyLogHandler(_BatchedFileHandler):
+    """Append the family record carried by each log record as one JSON line"""
+    
+    def encode(self, record: logging.LogRecord) -> bytes:
+        return _json_line(record.family_record)
+
+class _LogWriter:
+    """Queue, listener thread and batching handler for one log file, shared by every AuditLogger using it"""
+    
+    def __init__(self, path: str, handler_class, formatter: logging.Formatter = None, logger: logging.Logger = None):
+        self.path = path
+        self.users = 0
+        self.queue = queue.SimpleQueue()
+        self.handler = handler_class(path, self.queue)
+        if formatter is not None:
+            self.handler.setFormatter(formatter)
+        
+        # Records logged to `logger` reach the file through a QueueHandler, so
+        # propagation and any other handlers on it still see them; the handler
+        # merges the message arguments on the calling thread, so later changes
+        # to a caller's details dict don't alter what is written
+        self.logger = logger
+        self.queue_handler = logging.handlers.QueueHandler(self.queue)
+        if logger is not None:
+            logger.addHandler(self.queue_handler)
+        
+        self._listener = logging.handlers.QueueListener(self.queue, self.handler)
+        self._listener.start()
+        self._running = True
+        self._lock = threading.Lock()
+    
+    def flush(self, timeout: float = 5.0):
+        """Block until every record queued so far has been written"""
+        # The listener keeps running; a marker queued behind the pending records
+        # is signalled once everything before it is on disk
+        flushed = threading.Event()
+        with self._lock:
+            if not self._running:
+                return
+            self.queue.put(logging.makeLogRecord({'flushed': flushed}))
+        flushed.wait(timeout)
+    
+    def close(self):
+        """Write any queued records, stop the listener and close the file"""
+        with self._lock:
+            if self.logger is not None:
+                self.logger.removeHandler(self.queue_handler)
+            if self._running:
+                self._listener.stop()
+                self._running = False
+            self.handler.close()
+
+# Open log writers by absolute path
+_WRITERS: Dict[str, _LogWriter] = {}
+_WRITERS_LOCK = threading.Lock()
+
+def _acquire_writer(path: str, handler_class, formatter: logging.Formatter = None,
+                    logger: logging.Logger = None) -> _LogWriter:
+    """Return the shared writer for a log file, starting it on first use"""
+    path = os.path.abspath(path)
+    with _WRITERS_LOCK:
+        writer = _WRITERS.get(path)
+        if writer is None:
+            writer = _WRITERS[path] = _LogWriter(path, handler_class, formatter, logger)
+        writer.users += 1
+        return writer
+
+def _release_writers(*writers: _LogWriter):
+    """Drop one use of each writer, closing those nobody uses any more"""
+    for writer in writers:
+        with _WRITERS_LOCK:
+            writer.users -= 1
+            if writer.users > 0:
+                continue
+            del _WRITERS[writer.path]
+        writer.close()
+
+class _FamilyIndex:
+    """In-memory view of one family's audit records and running totals"""
+    __slots__ = ('records', 'activity_types', 'security_events', 'total')
+    
+    def __init__(self):
+        self.records = deque(maxlen=_FAMILY_RECORDS_PER_FAMILY)
+        self.activity_types = Counter()
+        self.security_events = 0
+        self.total = 0
+    
+    def add(self, record: Dict[str, Any]):
+        self.records.append(record)
+        self.total += 1
+        activity_type = record.get("activity_type")
+        if activity_type:
+            self.activity_types[activity_type] += 1
+        if record.get("security_event_type"):
+            self.security_events += 1
 
 class NetworkSecurityManager:
     """
@@ -24,24 +312,44 @@ class NetworkSecurityManager:
         self.config = config
         self.logger = logger
         self.blocked_logger = blocked_logger
+        
+        # Blocked requests are logged once when the blocked logger's records
+        # already reach the main logger by propagation
+        self._blocked_reaches_main = blocked_logger is logger or (blocked_logger.propagate and (
+            logger is logging.getLogger() or blocked_logger.name.startswith(logger.name + '.')
+        ))
+        
         self.network_config = config.get('network', {})
         
-        # Security state
-        self.blocked_attempts = []
-        self.allowed_requests = []
+        # Security state (bounded to the most recent entries)
+        self.blocked_attempts = deque(maxlen=1000)
+        self.allowed_requests = deque(maxlen=500)
+        self._append_blocked = self.blocked_attempts.append
+        self._append_allowed = self.allowed_requests.append
         self.security_lock = threading.Lock()
+        self._rebuild_domain_index()
+        
+        # Cached connectivity check result
+        self._conn_cache = None
+        self._conn_cache_ts = 0.0
+        self._conn_cache_ttl = _CONNECTIVITY_CACHE_TTL
         
         # Initialize security monitoring
         self._setup_security_monitoring()
     
+    @property
+    def _log_allowed(self) -> bool:
+        """Whether allowed requests are logged, read from the live network config"""
+        return bool(self.network_config.get('log_allowed_requests', False))
+    
     def _setup_security_monitoring(self):
         """Setup security monitoring and logging"""
         self.logger.info("Network security manager initialized")
-        self.logger.info(f"Online mode: {self.network_config.get('ALLOW_ONLINE', False)}")
+        self.logger.info("Online mode: %s", self.network_config.get('ALLOW_ONLINE', False))
         
         allowed_domains = self.network_config.get('allowed_domains', [])
         if allowed_domains:
-            self.logger.info(f"Allowed domains: {', '.join(allowed_domains)}")
+            self.logger.info("Allowed domains: %s", ', '.join(allowed_domains))
         else:
             self.logger.info("No allowed domains configured")
     
@@ -61,98 +369,142 @@ class NetworkSecurityManager:
             self._log_blocked_request(url, method, "Online mode disabled")
             return False
         
+        allowed, reason = self._evaluate_url(url)
+        if not allowed:
+            self._log_blocked_request(url, method, reason)
+            return False
+        
+        self._log_allowed_request(url, method)
+        return True
+    
+    def _evaluate_url(self, url: str) -> Tuple[bool, Optional[str]]:
+        """Decide whether a URL may be fetched in online mode, returning (allowed, block reason)"""
+        prefix = url[:5]
+        if not prefix.islower():
+            prefix = prefix.lower()
+        if prefix in _NON_NETWORK_SCHEMES:
+            return False, "Non-network URL scheme"
+        
         # Parse URL to check domain
         try:
-            parsed_url = urllib.parse.urlparse(url)
-            domain = parsed_url.netloc.lower()
-            
-            # Check allowed domains list
-            allowed_domains = self.network_config.get('allowed_domains', [])
-            if allowed_domains:
-                domain_allowed = any(
-                    domain == allowed_domain.lower() or 
-                    domain.endswith('.' + allowed_domain.lower())
-                    for allowed_domain in allowed_domains
-                )
-                
-                if not domain_allowed:
-                    self._log_blocked_request(url, method, f"Domain {domain} not in allowed list")
-                    return False
-            
-            # If we get here, request is allowed
-            self._log_allowed_request(url, method)
-            return True
-            
+            domain = _url_host(url)
         except Exception as e:
-            self._log_blocked_request(url, method, f"URL parsing error: {e}")
-            return False
+            return False, f"URL parsing error: {e}"
+        
+        # Check allowed domains list, re-indexing it if the config was edited in place
+        if self._domain_index_stale():
+            with self.security_lock:
+                if self._domain_index_stale():
+                    self._rebuild_domain_index()
+        if self._allowed_suffixes and not self._is_domain_allowed(domain):
+            return False, f"Domain {domain} not in allowed list"
+        
+        return True, None
+    
+    def _domain_index_stale(self) -> bool:
+        """Check whether the configured allowlist differs from the one last indexed"""
+        return self.network_config.get('allowed_domains', []) != self._indexed_domains
+    
+    def _rebuild_domain_index(self):
+        """Normalize the allowed domains once into an exact set, a suffix tuple and a label trie"""
+        allowed_domains = self.network_config.get('allowed_domains', [])
+        self._indexed_domains = list(allowed_domains)
+        self._allowed_suffixes = frozenset(_normalize_domain(domain) for domain in allowed_domains)
+        self._subdomain_suffixes = tuple('.' + domain for domain in self._allowed_suffixes)
+        
+        # Labels are inserted right to left (com -> example -> api); a None key
+        # marks an allowed domain, so anything below it matches too
+        trie = {}
+        for domain in self._allowed_suffixes:
+            node = trie
+            for label in reversed(domain.split('.')):
+                node = node.setdefault(label, {})
+            node[None] = True
+        self._domain_trie = trie
+        
+        # A fresh cache rather than clear(), so a check still running against
+        # the old index can't store its verdict where new checks will find it
+        self._decision_cache = OrderedDict()
+    
+    def _match_domain(self, domain: str) -> bool:
+        """Check for an exact allowed domain or a subdomain of one"""
+        if len(self._subdomain_suffixes) < _TRIE_MIN_DOMAINS:
+            return domain in self._allowed_suffixes or domain.endswith(self._subdomain_suffixes)
+        
+        node = self._domain_trie
+        for label in reversed(domain.split('.')):
+            node = node.get(label)
+            if node is None:
+                return False
+            if None in node:
+                return True
+        return False
+    
+    def _is_domain_allowed(self, domain: str) -> bool:
+        """Check a host against the allowlist (LRU-cached per host)"""
+        cache = self._decision_cache
+        allowed = cache.get(domain)
+        if allowed is not None:
+            try:
+                cache.move_to_end(domain)
+            except KeyError:
+                pass  # Evicted by a concurrent check
+            return allowed
+        
+        allowed = self._match_domain(domain)
+        cache[domain] = allowed
+        if len(cache) > _DECISION_CACHE_SIZE:
+            try:
+                cache.popitem(last=False)
+            except KeyError:
+                pass  # Emptied by concurrent evictions
+        return allowed
     
     def _log_blocked_request(self, url: str, method: str, reason: str):
         """Log a blocked network request"""
-        with self.security_lock:
-            timestamp = time.time()
-            blocked_entry = {
-                'timestamp': timestamp,
-                'url': url,
-                'method': method,
-                'reason': reason
-            }
-            
-            self.blocked_attempts.append(blocked_entry)
-            
-            # Keep only recent attempts (last 1000)
-            if len(self.blocked_attempts) > 1000:
-                self.blocked_attempts = self.blocked_attempts[-1000:]
-            
-            # Log to both loggers
-            log_msg = f"{method} {url} - BLOCKED: {reason}"
-            self.blocked_logger.warning(log_msg)
-            self.logger.warning(f"BLOCKED REQUEST: {log_msg}")
+        # deque.append is atomic, so the write path needs no lock
+        self._append_blocked(BlockedEntry(time.monotonic_ns(), url, method, reason))
+        
+        # The main logger only gets its own line when propagation won't deliver
+        # the blocked logger's record; stacklevel attributes both to the caller
+        self.blocked_logger.warning("%s %s - BLOCKED: %s", method, url, reason, stacklevel=2)
+        if not self._blocked_reaches_main:
+            self.logger.warning("BLOCKED REQUEST: %s %s - BLOCKED: %s", method, url, reason, stacklevel=2)
     
     def _log_allowed_request(self, url: str, method: str):
         """Log an allowed network request"""
-        with self.security_lock:
-            timestamp = time.time()
-            allowed_entry = {
-                'timestamp': timestamp,
-                'url': url,
-                'method': method
-            }
-            
-            self.allowed_requests.append(allowed_entry)
-            
-            # Keep only recent requests (last 500)
-            if len(self.allowed_requests) > 500:
-                self.allowed_requests = self.allowed_requests[-500:]
-            
-            # Log the allowed request
-            log_msg = f"{method} {url} - ALLOWED"
-            self.logger.info(f"ALLOWED REQUEST: {log_msg}")
+        self._append_allowed(AllowedEntry(time.monotonic_ns(), url, method))
+        
+        # Allowed traffic is still counted above; the log line is opt-in
+        if self._log_allowed and self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("ALLOWED REQUEST: %s %s - ALLOWED", method, url)
     
     def get_security_stats(self) -> Dict[str, Any]:
         """Get network security statistics"""
-        with self.security_lock:
-            return {
-                'online_mode': self.network_config.get('ALLOW_ONLINE', False),
-                'blocked_attempts': len(self.blocked_attempts),
-                'allowed_requests': len(self.allowed_requests),
-                'allowed_domains': self.network_config.get('allowed_domains', []),
-                'recent_blocked': self.blocked_attempts[-10:] if self.blocked_attempts else [],
-                'recent_allowed': self.allowed_requests[-10:] if self.allowed_requests else []
-            }
+        # len() and the tail copies are single C-level deque operations, so no
+        # lock is taken; the two histories may be an append apart
+        return {
+            'online_mode': self.network_config.get('ALLOW_ONLINE', False),
+            'blocked_attempts': len(self.blocked_attempts),
+            'allowed_requests': len(self.allowed_requests),
+            'allowed_domains': self.network_config.get('allowed_domains', []),
+            'recent_blocked': _tail(self.blocked_attempts, 10),
+            'recent_allowed': _tail(self.allowed_requests, 10)
+        }
     
     def get_blocked_attempts(self, limit: int = 50) -> List[Dict[str, Any]]:
         """Get recent blocked attempts"""
-        with self.security_lock:
-            return self.blocked_attempts[-limit:] if self.blocked_attempts else []
+        return _tail(self.blocked_attempts, limit)
     
     def get_allowed_requests(self, limit: int = 50) -> List[Dict[str, Any]]:
         """Get recent allowed requests"""
-        with self.security_lock:
-            return self.allowed_requests[-limit:] if self.allowed_requests else []
+        return _tail(self.allowed_requests, limit)
     
     def check_network_connectivity(self) -> Dict[str, Any]:
         """Check basic network connectivity without making external requests"""
+        if self._conn_cache is not None and time.monotonic() - self._conn_cache_ts < self._conn_cache_ttl:
+            return _copy_connectivity(self._conn_cache)
+        
         results = {
             'local_network': False,
             'gateway_reachable': False,
@@ -162,8 +514,7 @@ class NetworkSecurityManager:
         
         try:
             # Check network interfaces
-            import psutil
-            interfaces = psutil.net_if_addrs()
+            interfaces = psutil.net_if_addrs() if psutil is not None else {}
             
             for interface, addresses in interfaces.items():
                 if interface != 'lo':  # Skip loopback
@@ -178,11 +529,7 @@ class NetworkSecurityManager:
             
             # Check if we can reach the gateway (without external requests)
             try:
-                import subprocess
-                result = subprocess.run(['ip', 'route', 'show', 'default'], 
-                                      capture_output=True, text=True, timeout=5)
-                if result.returncode == 0 and 'default via' in result.stdout:
-                    results['gateway_reachable'] = True
+                results['gateway_reachable'] = _has_default_gateway()
             except Exception:
                 pass
             
@@ -196,9 +543,15 @@ class NetworkSecurityManager:
                 pass
                 
         except Exception as e:
-            self.logger.error(f"Network connectivity check failed: {e}")
+            self.logger.error("Network connectivity check failed: %s", e)
         
-        return results
+        self._conn_cache = results
+        self._conn_cache_ts = time.monotonic()
+        return _copy_connectivity(results)
+    
+    def invalidate_connectivity_cache(self):
+        """Force the next connectivity check to re-read interface and route state"""
+        self._conn_cache = None
     
     def enable_online_mode(self, allowed_domains: List[str] = None):
         """
@@ -207,35 +560,60 @@ class NetworkSecurityManager:
         Args:
             allowed_domains: List of allowed domains (optional)
         """
-        self.network_config['ALLOW_ONLINE'] = True
-        
-        if allowed_domains:
-            self.network_config['allowed_domains'] = allowed_domains
+        with self.security_lock:
+            self.network_config['ALLOW_ONLINE'] = True
+            
+            if allowed_domains:
+                self.network_config['allowed_domains'] = list(allowed_domains)
+                self._rebuild_domain_index()
+            else:
+                self._decision_cache = OrderedDict()
         
         self.logger.warning("ONLINE MODE ENABLED")
         if allowed_domains:
-            self.logger.info(f"Allowed domains: {', '.join(allowed_domains)}")
+            self.logger.info("Allowed domains: %s", ', '.join(allowed_domains))
     
     def disable_online_mode(self):
         """Disable online mode (block all outbound requests)"""
-        self.network_config['ALLOW_ONLINE'] = False
+        with self.security_lock:
+            self.network_config['ALLOW_ONLINE'] = False
+            self._decision_cache = OrderedDict()
         self.logger.warning("ONLINE MODE DISABLED - All outbound requests blocked")
     
     def add_allowed_domain(self, domain: str):
         """Add a domain to the allowed list"""
-        allowed_domains = self.network_config.get('allowed_domains', [])
-        if domain not in allowed_domains:
+        with self.security_lock:
+            if self._domain_index_stale():
+                self._rebuild_domain_index()
+            allowed_domains = self.network_config.get('allowed_domains', [])
+            if _normalize_domain(domain) in self._allowed_suffixes:
+                return
             allowed_domains.append(domain)
             self.network_config['allowed_domains'] = allowed_domains
-            self.logger.info(f"Added allowed domain: {domain}")
+            self._rebuild_domain_index()
+        self.logger.info("Added allowed domain: %s", domain)
     
     def remove_allowed_domain(self, domain: str):
         """Remove a domain from the allowed list"""
-        allowed_domains = self.network_config.get('allowed_domains', [])
-        if domain in allowed_domains:
-            allowed_domains.remove(domain)
+        normalized = _normalize_domain(domain)
+        with self.security_lock:
+            if self._domain_index_stale():
+                self._rebuild_domain_index()
+            allowed_domains = self.network_config.get('allowed_domains', [])
+            if normalized not in self._allowed_suffixes:
+                return
+            allowed_domains[:] = [d for d in allowed_domains if _normalize_domain(d) != normalized]
             self.network_config['allowed_domains'] = allowed_domains
-            self.logger.info(f"Removed allowed domain: {domain}")
+            self._rebuild_domain_index()
+        self.logger.info("Removed allowed domain: %s", domain)
+    
+    def update_config(self, config: Dict[str, Any]):
+        """Apply a reloaded configuration, dropping verdicts cached under the old one"""
+        with self.security_lock:
+            self.config = config
+            self.network_config = config.get('network', {})
+            self._rebuild_domain_index()
+        self.logger.info("Network configuration reloaded")
 
 class AuditLogger:
     """
@@ -246,7 +624,12 @@ class AuditLogger:
     def __init__(self, config: Dict[str, Any], logger: logging.Logger):
         self.config = config
         self.logger = logger
-        self.audit_events = []
+        
+        # Shared bounded history with running per-category counts; the lock
+        # keeps the counts in step with what the deque evicts
+        self.max_events = 10000
+        self.audit_events = deque(maxlen=self.max_events)
+        self._category_counts = Counter()
         self.audit_lock = threading.Lock()
         
         # Family-specific logging
@@ -254,23 +637,40 @@ class AuditLogger:
         os.makedirs(self.log_dir, exist_ok=True)
         self.family_log_file = os.path.join(self.log_dir, "family_audit.log")
         
+        # Family records indexed by family_id, seeded once from the existing log
+        self._family_index = defaultdict(_FamilyIndex)
+        self._family_lock = threading.Lock()
+        self._replay_family_log()
+        
         # Setup audit logging
         self._setup_audit_logging()
     
     def _setup_audit_logging(self):
         """Setup audit logging system"""
-        # Create audit log handler
-        audit_handler = logging.FileHandler('logs/audit.log')
-        audit_handler.setFormatter(logging.Formatter(
-            '%(asctime)s - AUDIT - %(levelname)s - %(message)s'
-        ))
-        
         self.audit_logger = logging.getLogger('Audit')
-        self.audit_logger.addHandler(audit_handler)
         self.audit_logger.setLevel(logging.INFO)
         
+        # Every AuditLogger writing to the same file shares one writer thread and
+        # descriptor; they are released on close(), garbage collection or exit
+        self._audit_writer = _acquire_writer('logs/audit.log', _BatchedFileHandler, logging.Formatter(
+            '%(asctime)s - AUDIT - %(levelname)s - %(message)s'
+        ), logger=self.audit_logger)
+        self._family_writer = _acquire_writer(self.family_log_file, _FamilyLogHandler)
+        self._release_writers = weakref.finalize(
+            self, _release_writers, self._audit_writer, self._family_writer
+        )
+        
         self.log_event('SYSTEM', 'Audit logging initialized')
     
+    def flush(self, timeout: float = 5.0):
+        """Block until every audit and family event logged so far has been written"""
+        self._audit_writer.flush(timeout)
+        self._family_writer.flush(timeout)
+    
+    def close(self):
+        """Release the log writers; safe to call more than once"""
+        self._release_writers()
+    
     def log_event(self, category: str, event: str, details: Dict[str, Any] = None):
         """
         Log an audit event
@@ -280,27 +680,19 @@ class AuditLogger:
             event: Event description
             details: Additional event details
         """
+        entry = AuditEntry(time.monotonic_ns(), category, event, details or {})
         with self.audit_lock:
-            timestamp = time.time()
-            audit_entry = {
-                'timestamp': timestamp,
-                'category': category,
-                'event': event,
-                'details': details or {}
-            }
-            
-            self.audit_events.append(audit_entry)
-            
-            # Keep only recent events (last 10000)
-            if len(self.audit_events) > 10000:
-                self.audit_events = self.audit_events[-10000:]
-            
-            # Log to audit logger
-            log_msg = f"[{category}] {event}"
-            if details:
-                log_msg += f" - Details: {details}"
-            
-            self.audit_logger.info(log_msg)
+            events = self.audit_events
+            if len(events) == events.maxlen:
+                self._category_counts[events[0].category] -= 1
+            events.append(entry)
+            self._category_counts[category] += 1
+        
+        # Log to audit logger
+        if details:
+            self.audit_logger.info("[%s] %s - Details: %s", category, event, details)
+        else:
+            self.audit_logger.info("[%s] %s", category, event)
     
     def log_user_action(self, action: str, details: Dict[str, Any] = None):
         """Log a user action"""
@@ -333,13 +725,19 @@ class AuditLogger:
     
     def get_audit_events(self, category: str = None, limit: int = 100) -> List[Dict[str, Any]]:
         """Get recent audit events"""
-        with self.audit_lock:
-            events = self.audit_events
-            
-            if category:
-                events = [e for e in events if e['category'] == category]
-            
-            return events[-limit:] if events else []
+        if limit <= 0:
+            # Same as slicing the history with [-limit:]: 0 returns everything
+            events = [e for e in tuple(self.audit_events) if not category or e.category == category]
+            return _as_dicts(events[-limit:])
+        
+        if not category:
+            return _tail(self.audit_events, limit)
+        
+        # Walk newest-first so only the matching tail is collected
+        matching = (e for e in reversed(tuple(self.audit_events)) if e.category == category)
+        events = list(itertools.islice(matching, limit))
+        events.reverse()
+        return _as_dicts(events)
     
     def log_family_activity(self, family_id: str, activity_type: str, details: Dict[str, Any] = None):
         """
@@ -388,13 +786,29 @@ class AuditLogger:
             'event_type': event_type
         })
     
-    def _write_family_log(self, record: Dict[str, Any]):
-        """Write record to family-specific audit log"""
+    def _replay_family_log(self):
+        """Index the records already in the family audit log"""
+        if not os.path.exists(self.family_log_file):
+            return
+        
         try:
-            with open(self.family_log_file, "a", encoding="utf-8") as f:
-                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            with open(self.family_log_file, "rb") as f:
+                for line in f:
+                    try:
+                        record = _json_loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    self._family_index[record.get("family_id")].add(record)
         except Exception as e:
-            self.logger.error(f"Failed to write family audit log: {e}")
+            self.logger.error("Failed to read family audit logs: %s", e)
+    
+    def _write_family_log(self, record: Dict[str, Any]):
+        """Index record and queue it for the family-specific audit log (written by the writer thread)"""
+        with self._family_lock:
+            self._family_index[record["family_id"]].add(record)
+        self._family_writer.queue.put(logging.makeLogRecord({
+            'name': 'Audit.Family', 'levelno': logging.INFO, 'levelname': 'INFO', 'family_record': record
+        }))
     
     def _redact_sensitive(self, details: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -409,22 +823,27 @@ class AuditLogger:
         if not isinstance(details, dict):
             return details
         
-        # List of sensitive field names to redact
-        sensitive_fields = {
-            "password", "token", "secret", "ssn", "social_security",
-            "credit_card", "bank_account", "api_key", "private_key",
-            "email", "phone", "address", "full_name", "real_name"
-        }
+        is_sensitive = _SENSITIVE_FIELD_RE.search
+        
+        # Common case: one search over all keys finds nothing and there is
+        # nothing nested, so a plain copy is already redacted
+        if not is_sensitive('\0'.join(details).lower()) and \
+                not any(isinstance(value, dict) for value in details.values()):
+            return dict(details)
         
+        # Walk nested dicts with an explicit stack instead of recursing
         redacted = {}
-        for key, value in details.items():
-            key_lower = key.lower()
-            if any(sensitive in key_lower for sensitive in sensitive_fields):
-                redacted[key] = "***REDACTED***"
-            elif isinstance(value, dict):
-                redacted[key] = self._redact_sensitive(value)
-            else:
-                redacted[key] = value
+        stack = [(details, redacted)]
+        while stack:
+            source, target = stack.pop()
+            for key, value in source.items():
+                if is_sensitive(key.lower()):
+                    target[key] = "***REDACTED***"
+                elif isinstance(value, dict):
+                    target[key] = child = {}
+                    stack.append((value, child))
+                else:
+                    target[key] = value
         
         return redacted
     
@@ -439,26 +858,15 @@ class AuditLogger:
         Returns:
             List of family audit log entries
         """
-        logs = []
-        if not os.path.exists(self.family_log_file):
-            return logs
-        
-        try:
-            with open(self.family_log_file, "r", encoding="utf-8") as f:
-                for line in f:
-                    try:
-                        record = json.loads(line.strip())
-                        if record.get("family_id") == family_id:
-                            logs.append(record)
-                    except json.JSONDecodeError:
-                        continue
-            
-            # Return most recent logs first, limited by the specified limit
-            return logs[-limit:] if len(logs) > limit else logs
+        with self._family_lock:
+            index = self._family_index.get(family_id)
+            if index is None:
+                return []
             
-        except Exception as e:
-            self.logger.error(f"Failed to read family audit logs: {e}")
-            return []
+            # Return the most recent logs, limited by the specified limit
+            records = _recent(index.records, limit) if limit > 0 else list(index.records)
+        
+        return [dict(record) for record in records]
     
     def get_family_audit_summary(self, family_id: str = None) -> Dict[str, Any]:
         """
@@ -470,69 +878,37 @@ class AuditLogger:
         Returns:
             Summary statistics for family audit logs
         """
-        if not os.path.exists(self.family_log_file):
+        with self._family_lock:
+            if family_id:
+                indexes = [self._family_index[family_id]] if family_id in self._family_index else []
+            else:
+                indexes = list(self._family_index.values())
+            
+            activity_types = Counter()
+            for index in indexes:
+                activity_types.update(index.activity_types)
+            
             return {
-                'total_family_events': 0,
-                'activity_types': {},
-                'security_events': 0,
-                'families_tracked': 0
+                'total_family_events': sum(index.total for index in indexes),
+                'activity_types': dict(activity_types),
+                'security_events': sum(index.security_events for index in indexes),
+                'families_tracked': len(self._family_index) if not family_id else 1
             }
-        
-        activity_types = {}
-        security_events = 0
-        families = set()
-        total_events = 0
-        
-        try:
-            with open(self.family_log_file, "r", encoding="utf-8") as f:
-                for line in f:
-                    try:
-                        record = json.loads(line.strip())
-                        
-                        # Filter by family_id if specified
-                        if family_id and record.get("family_id") != family_id:
-                            continue
-                        
-                        total_events += 1
-                        families.add(record.get("family_id", "unknown"))
-                        
-                        # Count activity types
-                        activity_type = record.get("activity_type")
-                        if activity_type:
-                            activity_types[activity_type] = activity_types.get(activity_type, 0) + 1
-                        
-                        # Count security events
-                        if record.get("security_event_type"):
-                            security_events += 1
-                            
-                    except json.JSONDecodeError:
-                        continue
-                        
-        except Exception as e:
-            self.logger.error(f"Failed to generate family audit summary: {e}")
-        
-        return {
-            'total_family_events': total_events,
-            'activity_types': activity_types,
-            'security_events': security_events,
-            'families_tracked': len(families) if not family_id else 1
-        }
     
     def get_audit_summary(self) -> Dict[str, Any]:
         """Get audit summary statistics"""
         with self.audit_lock:
-            categories = {}
-            for event in self.audit_events:
-                cat = event['category']
-                categories[cat] = categories.get(cat, 0) + 1
-            
-            # Include family audit summary
-            family_summary = self.get_family_audit_summary()
-            
-            return {
-                'total_events': len(self.audit_events),
-                'categories': categories,
-                'recent_events': self.audit_events[-10:] if self.audit_events else [],
-                'family_audit_summary': family_summary
-            }
+            total_events = len(self.audit_events)
+            categories = +self._category_counts
+            recent_events = _recent(self.audit_events, 10)
+        
+        # Include family audit summary
+        family_summary = self.get_family_audit_summary()
+        
+        return {
+            'total_events': total_events,
+            'categories': dict(categories),
+            'recent_events': _as_dicts(recent_events),
+            'family_audit_summary': family_summary
+        }
 
@@ -8,15 +8,22 @@ import os
 import sys
 import logging
 import importlib.util
-import traceback
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Callable
+from typing import Deque, Dict, List, Any, Optional, Callable, Tuple
 from dataclasses import dataclass
 import threading
+from concurrent.futures import ThreadPoolExecutor
 import time
+from collections import Counter, defaultdict, deque
 
-@dataclass
+_MAX_ANALYSIS_RESULTS = 1000
+_MAX_LOADER_THREADS = 8
+
+# Slotted dataclasses need Python 3.10; older interpreters keep a __dict__
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class ProtocolAnalysisResult:
     """Result of a protocol analysis"""
     protocol_name: str
@@ -27,8 +34,15 @@ class ProtocolAnalysisResult:
     technical_details: Dict[str, Any]
     timestamp: datetime
     execution_time: float
+    
+    # Display forms of timestamp, formatted only for results that are shown
+    def timestamp_iso(self) -> str:
+        return self.timestamp.isoformat()
+    
+    def timestamp_display(self) -> str:
+        return self.timestamp.strftime('%Y-%m-%d %H:%M:%S')
 
-@dataclass
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class ProtocolModule:
     """Protocol module metadata"""
     name: str
@@ -39,6 +53,16 @@ class ProtocolModule:
     supported_protocols: List[str]
     module_path: str
     loaded_module: Any = None
+    analyze_func: Optional[Callable] = None
+
+class _NullAuditLogger:
+    """Audit sink used when no audit logger is configured"""
+    
+    def log_system_event(self, *args, **kwargs):
+        pass
+    
+    def log_security_event(self, *args, **kwargs):
+        pass
 
 class ProtocolManager:
     """
@@ -46,19 +70,36 @@ class ProtocolManager:
     Manages protocol module loading, execution, and family-friendly reporting
     """
     
+    # Family-friendly summary openers, formatted with the module name on use
+    _STATUS_TEMPLATES = {
+        'secure': "✅ Great news! Your {m} security looks good.",
+        'warning': "⚠️ We found some areas where your {m} security could be improved.",
+        'critical': "🚨 Important: We found some serious security issues with {m} that need attention.",
+        'error': "❌ We couldn't complete the {m} security check due to a technical issue."
+    }
+    
     def __init__(self, config: Dict[str, Any], logger: logging.Logger, audit_logger=None):
         self.config = config
         self.logger = logger
-        self.audit_logger = audit_logger
+        self.audit_logger = audit_logger if audit_logger is not None else _NullAuditLogger()
         self.protocol_config = config.get('protocol_modules', {})
         
         # Protocol modules storage
         self.protocol_modules: Dict[str, ProtocolModule] = {}
-        self.analysis_results: List[ProtocolAnalysisResult] = []
+        # Imported modules keyed by path, with the (mtime_ns, size) they were loaded at
+        self._module_cache: Dict[str, Tuple[int, int, Any]] = {}
+        self.analysis_results: Deque[ProtocolAnalysisResult] = deque(maxlen=_MAX_ANALYSIS_RESULTS)
+        self._results_by_module: Dict[str, Deque[ProtocolAnalysisResult]] = defaultdict(
+            lambda: deque(maxlen=_MAX_ANALYSIS_RESULTS)
+        )
+        self.status_counts: Counter = Counter()
         self.analysis_lock = threading.Lock()
+        # Immutable (results, status_counts) view for readers; None when stale
+        self._results_snapshot: Optional[Tuple[Tuple[ProtocolAnalysisResult, ...], Dict[str, int]]] = None
         
         # Family-friendly formatting
         self.family_mode = self.protocol_config.get('family_friendly_mode', True)
+        self._status_get = self._STATUS_TEMPLATES.get
         
         # Initialize protocol manager
         self._setup_protocol_manager()
@@ -74,11 +115,10 @@ class ProtocolManager:
         self.logger.info(f"Protocol modules directory: {protocols_dir}")
         self.logger.info(f"Family-friendly mode: {self.family_mode}")
         
-        if self.audit_logger:
-            self.audit_logger.log_system_event("Protocol Manager initialized", {
-                'modules_directory': protocols_dir,
-                'family_friendly_mode': self.family_mode
-            })
+        self.audit_logger.log_system_event("Protocol Manager initialized", {
+            'modules_directory': protocols_dir,
+            'family_friendly_mode': self.family_mode
+        })
     
     def load_protocol_modules(self) -> int:
         """
@@ -98,40 +138,65 @@ class ProtocolManager:
             self.logger.warning(f"Protocol modules directory {protocols_dir} not found")
             return 0
         
+        # Python files only, skipping __init__.py and similar files
+        protocol_files = [
+            f for f in protocols_path.iterdir()
+            if f.suffix == '.py' and not f.name.startswith('__')
+        ]
+        
+        # Import modules concurrently; registration and audit logging stay on this thread
         loaded_count = 0
-        for protocol_file in protocols_path.glob('*.py'):
-            if protocol_file.name.startswith('__'):
-                continue  # Skip __init__.py and similar files
-            
+        workers = max(1, min(_MAX_LOADER_THREADS, os.cpu_count() or 1, len(protocol_files)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='ProtocolLoader') as executor:
+            futures = [(f, executor.submit(self._load_and_describe, f)) for f in protocol_files]
+        
+        protocol_modules = self.protocol_modules
+        log_info = self.logger.info
+        log_error = self.logger.error
+        log_debug = self.logger.debug
+        audit_log = self.audit_logger.log_system_event
+        
+        for protocol_file, future in futures:
             try:
                 module_name = protocol_file.stem
-                loaded_module = self._load_protocol_module(protocol_file, module_name)
+                metadata = future.result()
                 
-                if loaded_module:
-                    # Get module metadata
-                    metadata = self._extract_module_metadata(loaded_module, module_name, str(protocol_file))
-                    self.protocol_modules[module_name] = metadata
+                if metadata:
+                    protocol_modules[module_name] = metadata
                     loaded_count += 1
                     
-                    self.logger.info(f"Loaded protocol module: {module_name}")
+                    log_info(f"Loaded protocol module: {module_name}")
                     
-                    if self.audit_logger:
-                        self.audit_logger.log_system_event(f"Protocol module loaded", {
-                            'module': module_name,
-                            'version': metadata.version,
-                            'family_friendly': metadata.family_friendly
-                        })
+                    audit_log(f"Protocol module loaded", {
+                        'module': module_name,
+                        'version': metadata.version,
+                        'family_friendly': metadata.family_friendly
+                    })
                     
             except Exception as e:
-                self.logger.error(f"Failed to load protocol module {protocol_file}: {e}")
-                self.logger.debug(traceback.format_exc())
+                log_error(f"Failed to load protocol module {protocol_file}: {e}")
+                log_debug("Protocol module load traceback", exc_info=True)
         
         self.logger.info(f"Protocol modules loading complete: {loaded_count} modules loaded")
         return loaded_count
     
+    def _load_and_describe(self, protocol_file: Path) -> Optional[ProtocolModule]:
+        """Load a protocol module and extract its metadata (runs on a loader thread)"""
+        module_name = protocol_file.stem
+        loaded_module = self._load_protocol_module(protocol_file, module_name)
+        if not loaded_module:
+            return None
+        return self._extract_module_metadata(loaded_module, module_name, str(protocol_file))
+    
     def _load_protocol_module(self, module_path: Path, module_name: str) -> Optional[Any]:
-        """Load a single protocol module"""
+        """Load a single protocol module, reusing the previous import if the file is unchanged"""
         try:
+            st = module_path.stat()
+            cache_key = str(module_path)
+            cached = self._module_cache.get(cache_key)
+            if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+                return cached[2]
+            
             spec = importlib.util.spec_from_file_location(module_name, module_path)
             module = importlib.util.module_from_spec(spec)
             spec.loader.exec_module(module)
@@ -143,6 +208,7 @@ class ProtocolManager:
                     self.logger.error(f"Protocol module {module_name} missing required function: {func_name}")
                     return None
             
+            self._module_cache[cache_key] = (st.st_mtime_ns, st.st_size, module)
             return module
             
         except Exception as e:
@@ -151,6 +217,7 @@ class ProtocolManager:
     
     def _extract_module_metadata(self, module: Any, module_name: str, module_path: str) -> ProtocolModule:
         """Extract metadata from a loaded protocol module"""
+        analyze_func = getattr(module, 'analyze')
         try:
             metadata_func = getattr(module, 'get_metadata')
             metadata = metadata_func()
@@ -163,7 +230,8 @@ class ProtocolManager:
                 family_friendly=metadata.get('family_friendly', True),
                 supported_protocols=metadata.get('supported_protocols', []),
                 module_path=module_path,
-                loaded_module=module
+                loaded_module=module,
+                analyze_func=analyze_func
             )
             
         except Exception as e:
@@ -177,7 +245,8 @@ class ProtocolManager:
                 family_friendly=True,
                 supported_protocols=[],
                 module_path=module_path,
-                loaded_module=module
+                loaded_module=module,
+                analyze_func=analyze_func
             )
     
     def list_protocol_modules(self) -> List[Dict[str, Any]]:
@@ -206,80 +275,100 @@ class ProtocolManager:
         Returns:
             ProtocolAnalysisResult or None if failed
         """
-        if module_name not in self.protocol_modules:
+        module_info = self.protocol_modules.get(module_name)
+        if module_info is None:
             self.logger.error(f"Protocol module '{module_name}' not found")
             return None
         
-        module_info = self.protocol_modules[module_name]
-        module = module_info.loaded_module
-        
-        start_time = time.time()
+        start_ns = time.monotonic_ns()
         
         try:
             self.logger.info(f"Running protocol analysis: {module_name} on target: {target}")
             
-            if self.audit_logger:
-                self.audit_logger.log_system_event(f"Protocol analysis started", {
-                    'module': module_name,
-                    'target': target,
-                    'kwargs': kwargs
-                })
+            self.audit_logger.log_system_event(f"Protocol analysis started", {
+                'module': module_name,
+                'target': target,
+                'kwargs': kwargs
+            })
             
             # Run the analysis
-            analysis_func = getattr(module, 'analyze')
-            raw_result = analysis_func(target=target, **kwargs)
+            raw_result = module_info.analyze_func(target=target, **kwargs)
             
-            execution_time = time.time() - start_time
+            execution_time = (time.monotonic_ns() - start_ns) / 1e9
             
             # Process and format the result
             result = self._process_analysis_result(
                 module_name, raw_result, execution_time
             )
             
-            # Store the result
+            # Store the result; the deque drops the oldest once full
             with self.analysis_lock:
-                self.analysis_results.append(result)
-                # Keep only recent results (last 1000)
-                if len(self.analysis_results) > 1000:
-                    self.analysis_results = self.analysis_results[-1000:]
+                self._append_result(result)
             
             self.logger.info(f"Protocol analysis completed: {module_name} - Status: {result.status}")
             
-            if self.audit_logger:
-                self.audit_logger.log_system_event(f"Protocol analysis completed", {
-                    'module': module_name,
-                    'status': result.status,
-                    'findings_count': len(result.findings),
-                    'execution_time': execution_time
-                })
+            self.audit_logger.log_system_event(f"Protocol analysis completed", {
+                'module': module_name,
+                'status': result.status,
+                'findings_count': len(result.findings),
+                'execution_time': execution_time
+            })
             
             return result
             
         except Exception as e:
-            execution_time = time.time() - start_time
-            error_msg = f"Error running protocol analysis {module_name}: {e}"
-            self.logger.error(error_msg)
-            self.logger.debug(traceback.format_exc())
+            execution_time = (time.monotonic_ns() - start_ns) / 1e9
+            err_str = str(e)
+            self.logger.error(f"Error running protocol analysis {module_name}: {err_str}")
+            self.logger.debug("Protocol analysis traceback", exc_info=True)
             
-            if self.audit_logger:
-                self.audit_logger.log_security_event(f"Protocol analysis error", {
-                    'module': module_name,
-                    'error': str(e),
-                    'execution_time': execution_time
-                })
+            self.audit_logger.log_security_event(f"Protocol analysis error", {
+                'module': module_name,
+                'error': err_str,
+                'execution_time': execution_time
+            })
             
             # Return error result
             return ProtocolAnalysisResult(
                 protocol_name=module_name,
                 status="error",
                 findings=[],
-                recommendations=[f"Analysis failed: {str(e)}"],
+                recommendations=[f"Analysis failed: {err_str}"],
                 family_friendly_summary=f"Unable to complete {module_name} analysis due to an error.",
-                technical_details={'error': str(e)},
+                technical_details={'error': err_str},
                 timestamp=datetime.now(),
                 execution_time=execution_time
             )
     
+    def _append_result(self, result: ProtocolAnalysisResult):
+        """Store a result, keeping the module index and status counts in step (caller holds analysis_lock)"""
+        results = self.analysis_results
+        if len(results) == results.maxlen:
+            evicted = results.popleft()
+            # The evicted result is also the oldest entry in its module's history
+            module_results = self._results_by_module[evicted.protocol_name]
+            module_results.popleft()
+            if not module_results:
+                del self._results_by_module[evicted.protocol_name]
+            self.status_counts[evicted.status] -= 1
+            if not self.status_counts[evicted.status]:
+                del self.status_counts[evicted.status]
+        results.append(result)
+        self._results_by_module[result.protocol_name].append(result)
+        self.status_counts[result.status] += 1
+        self._results_snapshot = None
+    
+    def _get_results_snapshot(self) -> Tuple[Tuple[ProtocolAnalysisResult, ...], Dict[str, int]]:
+        """Return the published results view, rebuilding it once after new results arrive"""
+        snapshot = self._results_snapshot
+        if snapshot is None:
+            with self.analysis_lock:
+                snapshot = self._results_snapshot
+                if snapshot is None:
+                    snapshot = (tuple(self.analysis_results), dict(self.status_counts))
+                    self._results_snapshot = snapshot
+        return snapshot
+    
     def _process_analysis_result(self, module_name: str, raw_result: Dict[str, Any], execution_time: float) -> ProtocolAnalysisResult:
         """Process raw analysis result into standardized format"""
         
@@ -311,70 +400,54 @@ class ProtocolManager:
         if not self.family_mode:
             return f"Protocol analysis '{module_name}' completed with status: {status}"
         
-        # Status-based summaries
-        status_messages = {
-            'secure': f"✅ Great news! Your {module_name} security looks good.",
-            'warning': f"⚠️ We found some areas where your {module_name} security could be improved.",
-            'critical': f"🚨 Important: We found some serious security issues with {module_name} that need attention.",
-            'error': f"❌ We couldn't complete the {module_name} security check due to a technical issue."
-        }
-        
-        base_message = status_messages.get(status, f"We completed the {module_name} security analysis.")
+        # Status-based summary
+        template = self._status_get(status)
+        if template:
+            base_message = template.format(m=module_name)
+        else:
+            base_message = f"We completed the {module_name} security analysis."
         
         # Add findings summary
         if findings:
             findings_count = len(findings)
-            if findings_count == 1:
-                base_message += f" We found 1 item to review."
-            else:
-                base_message += f" We found {findings_count} items to review."
+            base_message += f" We found {findings_count} {'item' if findings_count == 1 else 'items'} to review."
         
         # Add recommendations summary
         if recommendations:
             rec_count = len(recommendations)
-            if rec_count == 1:
-                base_message += f" We have 1 recommendation to help improve your security."
-            else:
-                base_message += f" We have {rec_count} recommendations to help improve your security."
+            base_message += f" We have {rec_count} {'recommendation' if rec_count == 1 else 'recommendations'} to help improve your security."
         
         return base_message
     
     def get_analysis_results(self, module_name: str = None, limit: int = 50) -> List[ProtocolAnalysisResult]:
         """Get recent analysis results"""
-        with self.analysis_lock:
-            results = self.analysis_results
-            
-            if module_name:
-                results = [r for r in results if r.protocol_name == module_name]
-            
-            return results[-limit:] if results else []
+        if module_name:
+            with self.analysis_lock:
+                results = list(self._results_by_module.get(module_name, ()))
+        else:
+            results = list(self._get_results_snapshot()[0])
+        
+        return results[-limit:] if results else []
     
     def get_protocol_summary(self) -> Dict[str, Any]:
         """Get summary of protocol manager status"""
-        with self.analysis_lock:
-            recent_results = self.analysis_results[-10:] if self.analysis_results else []
-            
-            # Count results by status
-            status_counts = {}
-            for result in self.analysis_results:
-                status = result.status
-                status_counts[status] = status_counts.get(status, 0) + 1
-            
-            return {
-                'modules_loaded': len(self.protocol_modules),
-                'total_analyses': len(self.analysis_results),
-                'status_breakdown': status_counts,
-                'recent_results': [
-                    {
-                        'protocol': r.protocol_name,
-                        'status': r.status,
-                        'timestamp': r.timestamp.isoformat(),
-                        'summary': r.family_friendly_summary
-                    }
-                    for r in recent_results
-                ],
-                'family_friendly_mode': self.family_mode
-            }
+        results, status_counts = self._get_results_snapshot()
+        
+        return {
+            'modules_loaded': len(self.protocol_modules),
+            'total_analyses': len(results),
+            'status_breakdown': dict(status_counts),
+            'recent_results': [
+                {
+                    'protocol': r.protocol_name,
+                    'status': r.status,
+                    'timestamp': r.timestamp_iso(),
+                    'summary': r.family_friendly_summary
+                }
+                for r in results[-10:]
+            ],
+            'family_friendly_mode': self.family_mode
+        }
     
     def format_analysis_report(self, result: ProtocolAnalysisResult, detailed: bool = False) -> str:
         """Format analysis result for display"""
@@ -387,28 +460,28 @@ class ProtocolManager:
     def _format_family_friendly_report(self, result: ProtocolAnalysisResult, detailed: bool) -> str:
         """Format family-friendly analysis report"""
         
-        report = []
-        report.append(f"🔍 {result.protocol_name.title()} Security Check")
-        report.append("=" * 40)
-        report.append(f"Status: {result.status.upper()}")
-        report.append(f"Completed: {result.timestamp.strftime('%Y-%m-%d %H:%M:%S')}")
-        report.append("")
-        report.append("Summary:")
-        report.append(result.family_friendly_summary)
-        report.append("")
+        report = [
+            f"🔍 {result.protocol_name.title()} Security Check",
+            "=" * 40,
+            f"Status: {result.status.upper()}",
+            f"Completed: {result.timestamp_display()}",
+            "",
+            "Summary:",
+            result.family_friendly_summary,
+            ""
+        ]
         
         if result.recommendations:
             report.append("🛠️ What You Can Do:")
-            for i, rec in enumerate(result.recommendations, 1):
-                report.append(f"  {i}. {rec}")
+            report.extend([f"  {i}. {rec}" for i, rec in enumerate(result.recommendations, 1)])
             report.append("")
         
         if detailed and result.findings:
             report.append("📋 Detailed Findings:")
-            for i, finding in enumerate(result.findings, 1):
-                severity = finding.get('severity', 'info')
-                description = finding.get('description', 'No description')
-                report.append(f"  {i}. [{severity.upper()}] {description}")
+            report.extend([
+                f"  {i}. [{finding.get('severity', 'info').upper()}] {finding.get('description', 'No description')}"
+                for i, finding in enumerate(result.findings, 1)
+            ])
             report.append("")
         
         return "\n".join(report)
@@ -416,30 +489,28 @@ class ProtocolManager:
     def _format_technical_report(self, result: ProtocolAnalysisResult, detailed: bool) -> str:
         """Format technical analysis report"""
         
-        report = []
-        report.append(f"Protocol Analysis Report: {result.protocol_name}")
-        report.append("=" * 50)
-        report.append(f"Status: {result.status}")
-        report.append(f"Execution Time: {result.execution_time:.2f}s")
-        report.append(f"Timestamp: {result.timestamp.isoformat()}")
-        report.append("")
+        report = [
+            f"Protocol Analysis Report: {result.protocol_name}",
+            "=" * 50,
+            f"Status: {result.status}",
+            f"Execution Time: {result.execution_time:.2f}s",
+            f"Timestamp: {result.timestamp_iso()}",
+            ""
+        ]
         
         if result.findings:
             report.append("Findings:")
-            for finding in result.findings:
-                report.append(f"  - {finding}")
+            report.extend([f"  - {finding}" for finding in result.findings])
             report.append("")
         
         if result.recommendations:
             report.append("Recommendations:")
-            for rec in result.recommendations:
-                report.append(f"  - {rec}")
+            report.extend([f"  - {rec}" for rec in result.recommendations])
             report.append("")
         
         if detailed and result.technical_details:
             report.append("Technical Details:")
-            for key, value in result.technical_details.items():
-                report.append(f"  {key}: {value}")
+            report.extend([f"  {key}: {value}" for key, value in result.technical_details.items()])
             report.append("")
         
         return "\n".join(report)
@@ -449,13 +520,11 @@ class ProtocolManager:
         self.family_mode = True
         self.logger.info("Family-friendly mode enabled")
         
-        if self.audit_logger:
-            self.audit_logger.log_system_event("Family mode enabled")
+        self.audit_logger.log_system_event("Family mode enabled")
     
     def disable_family_mode(self):
         """Disable family-friendly mode"""
         self.family_mode = False
         self.logger.info("Family-friendly mode disabled")
         
-        if self.audit_logger:
-            self.audit_logger.log_system_event("Family mode disabled")
\ No newline at end of file
+        self.audit_logger.log_system_event("Family mode disabled")
\ No newline at end of file
@@ -6,12 +6,34 @@ Generates personalized security recommendations based on family profiles and thr
 
 import json
 import logging
+import functools
 from datetime import datetime, timedelta
 from dataclasses import dataclass, asdict
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
 from pathlib import Path
 from enum import Enum
 
+_SKILL_WEIGHTS = {"beginner": 1, "intermediate": 2, "advanced": 3}
+_CHILD_AGE_GROUPS = frozenset(("child", "teen"))
+_NET_TYPES = frozenset(("router", "modem"))
+_ENDPOINT_TYPES = frozenset(("smartphone", "tablet", "computer"))
+_ENDPOINT_CATEGORIES = frozenset(("device_security", "authentication"))
+
+@functools.lru_cache(maxsize=128)
+def _average_skill_level(skill_levels: Tuple[str, ...]) -> str:
+    """Map a family's member skill levels to an overall skill level"""
+    if not skill_levels:
+        return "beginner"
+    
+    avg_weight = sum(_SKILL_WEIGHTS.get(level, 1) for level in skill_levels) / len(skill_levels)
+    
+    if avg_weight <= 1.3:
+        return "beginner"
+    elif avg_weight <= 2.3:
+        return "intermediate"
+    else:
+        return "advanced"
+
 class Priority(Enum):
     CRITICAL = "critical"
     HIGH = "high"
@@ -82,11 +104,15 @@ class RecommendationEngine:
         self.logger = logger
         self.recommendations: Dict[str, SecurityRecommendation] = {}
         
+        # Bumped whenever the templates change, so callers can key caches on it
+        self.data_version = 0
+        
         # Load recommendation templates
         self._load_recommendation_templates()
         
     def _load_recommendation_templates(self):
         """Load predefined recommendation templates"""
+        self.data_version += 1
         self.templates = {
             "password_manager": {
                 "title": "Set up a family password manager",
@@ -179,13 +205,14 @@ class RecommendationEngine:
         
         # Analyze family profile to determine relevant recommendations
         relevant_templates = self._filter_templates_by_profile(family_profile)
+        avg_skill_level = self._get_average_skill_level(family_profile)
         
         for template_key, template in relevant_templates.items():
             # Create personalized recommendation
             rec_id = f"{family_profile.family_id}_{template_key}_{int(current_time.timestamp())}"
             
             # Customize for family
-            customized_template = self._customize_template(template, family_profile)
+            customized_template = self._customize_template(template, family_profile, avg_skill_level)
             
             recommendation = SecurityRecommendation(
                 recommendation_id=rec_id,
@@ -221,7 +248,7 @@ class RecommendationEngine:
         relevant_templates["device_updates"] = self.templates["device_updates"]
         
         # Include child-specific recommendations if family has children
-        has_children = any(member.get("age_group") in ["child", "teen"] for member in family_profile.members)
+        has_children = any(member.get("age_group") in _CHILD_AGE_GROUPS for member in family_profile.members)
         if has_children:
             relevant_templates["child_privacy"] = self.templates["child_privacy"]
         
@@ -231,12 +258,13 @@ class RecommendationEngine:
         
         return relevant_templates
     
-    def _customize_template(self, template: Dict, family_profile: FamilyProfile) -> Dict:
+    def _customize_template(self, template: Dict, family_profile: FamilyProfile, avg_skill_level: Optional[str] = None) -> Dict:
         """Customize recommendation template for specific family"""
         customized = template.copy()
         
         # Adjust difficulty based on family tech skill level
-        avg_skill_level = self._get_average_skill_level(family_profile)
+        if avg_skill_level is None:
+            avg_skill_level = self._get_average_skill_level(family_profile)
         if avg_skill_level == "beginner" and template["difficulty"] == Difficulty.ADVANCED:
             customized["difficulty"] = Difficulty.MODERATE
             customized["steps"] = self._simplify_steps(template["steps"])
@@ -253,20 +281,9 @@ class RecommendationEngine:
     
     def _get_average_skill_level(self, family_profile: FamilyProfile) -> str:
         """Calculate average technical skill level of family"""
-        skill_levels = [member.get("tech_skill_level", "beginner") for member in family_profile.members]
-        skill_weights = {"beginner": 1, "intermediate": 2, "advanced": 3}
-        
-        if not skill_levels:
-            return "beginner"
-        
-        avg_weight = sum(skill_weights.get(level, 1) for level in skill_levels) / len(skill_levels)
-        
-        if avg_weight <= 1.3:
-            return "beginner"
-        elif avg_weight <= 2.3:
-            return "intermediate"
-        else:
-            return "advanced"
+        return _average_skill_level(tuple(
+            member.get("tech_skill_level", "beginner") for member in family_profile.members
+        ))
     
     def _simplify_steps(self, steps: List[str]) -> List[str]:
         """Simplify steps for beginner users"""
@@ -285,15 +302,18 @@ class RecommendationEngine:
         """Get list of devices this recommendation applies to"""
         category = template["category"]
         applicable_devices = []
+        child_ids = frozenset(
+            m.get("member_id") for m in family_profile.members if m.get("age_group") in _CHILD_AGE_GROUPS
+        ) if category == "child_safety" else frozenset()
         
         for device in family_profile.devices:
             device_type = device.get("device_type", "")
             
-            if category == "network" and device_type in ["router", "modem"]:
+            if category == "network" and device_type in _NET_TYPES:
                 applicable_devices.append(device.get("device_id", ""))
-            elif category in ["device_security", "authentication"] and device_type in ["smartphone", "tablet", "computer"]:
+            elif category in _ENDPOINT_CATEGORIES and device_type in _ENDPOINT_TYPES:
                 applicable_devices.append(device.get("device_id", ""))
-            elif category == "child_safety" and device.get("owner") in [m.get("member_id") for m in family_profile.members if m.get("age_group") in ["child", "teen"]]:
+            elif category == "child_safety" and device.get("owner") in child_ids:
                 applicable_devices.append(device.get("device_id", ""))
         
         return applicable_devices
@@ -307,7 +327,7 @@ class RecommendationEngine:
             member_id = member.get("member_id", "")
             age_group = member.get("age_group", "adult")
             
-            if category == "child_safety" and age_group in ["child", "teen"]:
+            if category == "child_safety" and age_group in _CHILD_AGE_GROUPS:
                 applicable_members.append(member_id)
             elif category in ["authentication", "network", "device_security", "data_protection"]:
                 applicable_members.append(member_id)
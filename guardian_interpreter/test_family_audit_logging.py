@@ -10,6 +10,7 @@ import shutil
 import os
 import json
 import logging
+import threading
 from datetime import datetime
 from network_security import AuditLogger
 
@@ -38,6 +39,8 @@ class TestFamilyAuditLogging(unittest.TestCase):
     
     def tearDown(self):
         """Clean up test environment"""
+        self.audit_logger.close()
+        
         # Remove temporary directory
         shutil.rmtree(self.test_dir)
     
@@ -55,6 +58,7 @@ class TestFamilyAuditLogging(unittest.TestCase):
         self.audit_logger.log_family_activity(family_id, activity_type, details)
         
         # Verify log was written
+        self.audit_logger.flush()
         family_log_path = os.path.join(self.test_dir, "family_audit.log")
         self.assertTrue(os.path.exists(family_log_path))
         
@@ -83,6 +87,7 @@ class TestFamilyAuditLogging(unittest.TestCase):
         self.audit_logger.log_family_security_event(family_id, event_type, details)
         
         # Verify log was written
+        self.audit_logger.flush()
         family_log_path = os.path.join(self.test_dir, "family_audit.log")
         self.assertTrue(os.path.exists(family_log_path))
         
@@ -114,6 +119,7 @@ class TestFamilyAuditLogging(unittest.TestCase):
         self.audit_logger.log_family_activity(family_id, activity_type, details)
         
         # Read and verify sensitive data was redacted
+        self.audit_logger.flush()
         family_log_path = os.path.join(self.test_dir, "family_audit.log")
         with open(family_log_path, 'r') as f:
             log_line = f.readline().strip()
@@ -194,6 +200,7 @@ class TestFamilyAuditLogging(unittest.TestCase):
         self.audit_logger.log_family_activity(family_id, activity_type, details)
         
         # Read and verify nested sensitive data was redacted
+        self.audit_logger.flush()
         family_log_path = os.path.join(self.test_dir, "family_audit.log")
         with open(family_log_path, 'r') as f:
             log_line = f.readline().strip()
@@ -223,6 +230,7 @@ class TestFamilyAuditLogging(unittest.TestCase):
         self.audit_logger.log_family_activity(family_id, "query", details_with_session)
         
         # Verify session ID is preserved
+        self.audit_logger.flush()
         family_log_path = os.path.join(self.test_dir, "family_audit.log")
         with open(family_log_path, 'r') as f:
             log_line = f.readline().strip()
@@ -252,6 +260,167 @@ class TestFamilyAuditLogging(unittest.TestCase):
         # Verify we get the most recent logs
         self.assertIn("Test question 9", logs_3[-1]['details']['question'])
 
+    def test_family_index_replayed_from_log(self):
+        """Test that a new AuditLogger indexes family records already on disk"""
+        family_id = "test_family_010"
+        self.audit_logger.log_family_activity(family_id, "query", {"question": "Replay test"})
+        self.audit_logger.log_family_security_event(family_id, "threat_detected", {"level": "low"})
+        self.audit_logger.flush()
+
+        reloaded = AuditLogger(self.config, self.logger)
+        self.addCleanup(reloaded.close)
+        logs = reloaded.get_family_logs(family_id)
+        self.assertEqual(len(logs), 2)
+        self.assertEqual(logs[0]['details']['question'], "Replay test")
+        self.assertIn('timestamp', logs[0])
+
+        summary = reloaded.get_family_audit_summary(family_id)
+        self.assertEqual(summary['total_family_events'], 2)
+        self.assertEqual(summary['security_events'], 1)
+
+    def test_audit_events_written_after_flush(self):
+        """Test that queued audit events reach the audit log on flush"""
+        for i in range(300):
+            self.audit_logger.log_system_event(f"Flush test event {i}")
+
+        self.audit_logger.flush()
+
+        with open('logs/audit.log', 'r') as f:
+            lines = f.read().splitlines()
+
+        self.assertIn("[SYSTEM] Flush test event 299", lines[-1])
+        self.assertIn("[SYSTEM] Flush test event 0", lines[-300])
+
+    def test_audit_events_reach_logging_handlers(self):
+        """Test that handlers configured on the Audit logger still receive audit records"""
+        records = []
+        handler = logging.Handler()
+        handler.emit = records.append
+        audit = logging.getLogger('Audit')
+        audit.addHandler(handler)
+        self.addCleanup(audit.removeHandler, handler)
+
+        self.audit_logger.log_security_event("Handler test", {'source': 'test'})
+
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0].getMessage(), "[SECURITY] Handler test - Details: {'source': 'test'}")
+        self.assertEqual(records[0].funcName, 'log_event')
+
+    def test_loggers_share_writers(self):
+        """Test that loggers on the same files share one writer and close idempotently"""
+        audit = logging.getLogger('Audit')
+        threads_before = threading.active_count()
+        handlers_before = len(audit.handlers)
+
+        others = [AuditLogger(self.config, self.logger) for _ in range(5)]
+        self.assertEqual(threading.active_count(), threads_before)
+        self.assertEqual(len(audit.handlers), handlers_before)
+
+        for other in others:
+            other.close()
+            other.close()
+
+        # The remaining logger still writes through the shared writers
+        self.audit_logger.log_family_activity("test_family_011", "query", {"question": "Still open"})
+        self.audit_logger.flush()
+        with open(os.path.join(self.test_dir, "family_audit.log"), 'r') as f:
+            self.assertIn("Still open", f.read())
+
+    def test_audit_details_captured_when_logged(self):
+        """Test that changing a details dict after logging doesn't change the written line"""
+        details = {'step': 'before'}
+        self.audit_logger.log_system_event("Mutation test", details)
+        details['step'] = 'after'
+        self.audit_logger.flush()
+
+        with open('logs/audit.log', 'r') as f:
+            lines = [line for line in f if "Mutation test" in line]
+        self.assertIn("'step': 'before'", lines[-1])
+
+    def test_flush_keeps_writer_running(self):
+        """Test that concurrent flushes from several threads lose no events"""
+        def worker(n):
+            for i in range(100):
+                self.audit_logger.log_family_activity("test_family_012", "query", {"question": f"{n}-{i}"})
+                if i % 25 == 0:
+                    self.audit_logger.flush()
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.audit_logger.flush()
+
+        with open(os.path.join(self.test_dir, "family_audit.log"), 'r') as f:
+            self.assertEqual(len(f.readlines()), 400)
+
+    def test_audit_summary_counts_track_eviction(self):
+        """Test that category counts drop entries evicted from the history"""
+        maxlen = self.audit_logger.max_events
+        for i in range(maxlen):
+            self.audit_logger.log_user_action(f"Action {i}")
+
+        summary = self.audit_logger.get_audit_summary()
+        self.assertEqual(summary['total_events'], maxlen)
+        self.assertEqual(summary['categories'], {'USER': maxlen})
+        self.assertEqual(summary['recent_events'][-1]['event'], f"Action {maxlen - 1}")
+
+        for i in range(5):
+            self.audit_logger.log_security_event(f"Alert {i}")
+        summary = self.audit_logger.get_audit_summary()
+        self.assertEqual(summary['total_events'], maxlen)
+        self.assertEqual(summary['categories'], {'USER': maxlen - 5, 'SECURITY': 5})
+
+    def test_audit_events_limit(self):
+        """Test that limit returns the most recent events and 0 returns all of them"""
+        for i in range(5):
+            self.audit_logger.log_user_action(f"Action {i}")
+
+        events = self.audit_logger.get_audit_events('USER', limit=2)
+        self.assertEqual([e['event'] for e in events], ["Action 3", "Action 4"])
+        self.assertEqual(len(self.audit_logger.get_audit_events('USER', limit=0)), 5)
+        self.assertEqual(len(self.audit_logger.get_audit_events(limit=0)), 6)
+
+    def test_audit_events_merged_across_threads(self):
+        """Test that events logged from several threads are returned in time order"""
+        def worker(n):
+            for i in range(50):
+                self.audit_logger.log_skill_execution(f"skill_{n}", [str(i)])
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        events = self.audit_logger.get_audit_events('SKILL', limit=1000)
+        self.assertEqual(len(events), 200)
+        for n in range(4):
+            arguments = [e['details']['arguments'] for e in events if e['details']['skill'] == f"skill_{n}"]
+            self.assertEqual(arguments, [[str(i)] for i in range(50)])
+        self.assertEqual(self.audit_logger.get_audit_summary()['categories']['SKILL'], 200)
+
+    def test_audit_retention_is_global_across_exited_threads(self):
+        """Test that events from finished threads share one bounded history"""
+        maxlen = self.audit_logger.max_events
+
+        def worker(n):
+            for i in range(maxlen // 4):
+                self.audit_logger.log_user_action(f"Thread {n} action {i}")
+
+        for n in range(8):
+            thread = threading.Thread(target=worker, args=(n,))
+            thread.start()
+            thread.join()
+
+        summary = self.audit_logger.get_audit_summary()
+        self.assertEqual(summary['total_events'], maxlen)
+        self.assertEqual(summary['categories'], {'USER': maxlen})
+        self.assertEqual(len(self.audit_logger.get_audit_events(limit=0)), maxlen)
+        self.assertEqual(self.audit_logger.get_audit_events(limit=1)[0]['event'], f"Thread 7 action {maxlen // 4 - 1}")
+        self.assertEqual(self.audit_logger.get_audit_events(limit=0)[0]['event'], "Thread 4 action 0")
+
 if __name__ == '__main__':
     # Run the tests
     unittest.main()
\ No newline at end of file
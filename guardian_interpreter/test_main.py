@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Test suite for the Guardian Node entry point
+Tests MCP stdio startup and streamed LLM answers in the family CLI
+"""
+
+import unittest
+import importlib.util
+import io
+import json
+import logging
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import main
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+MCP_INSTALLED = importlib.util.find_spec('mcp') is not None
+
+INITIALIZE_REQUEST = {
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "initialize",
+    "params": {
+        "protocolVersion": "2024-11-05",
+        "capabilities": {},
+        "clientInfo": {"name": "guardian-test", "version": "1.0.0"}
+    }
+}
+
+def run_main_mcp(stdin_data: bytes):
+    """Run 'main --mcp' as a subprocess and return the completed process"""
+    return subprocess.run(
+        [sys.executable, '-m', 'guardian_interpreter.main', '--mcp'],
+        cwd=REPO_ROOT,
+        input=stdin_data,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        timeout=120
+    )
+
+class TestMainMCPMode(unittest.TestCase):
+    """Test cases for running main.py as an MCP stdio server"""
+
+    @unittest.skipUnless(MCP_INSTALLED, "mcp package not installed")
+    def test_first_stdout_bytes_are_jsonrpc_frame(self):
+        """Test that nothing precedes the first JSON-RPC frame on stdout"""
+        proc = run_main_mcp(json.dumps(INITIALIZE_REQUEST).encode() + b"\n")
+
+        self.assertTrue(proc.stdout.startswith(b"{"), proc.stdout[:200])
+        frame = json.loads(proc.stdout.splitlines()[0])
+        self.assertEqual(frame["jsonrpc"], "2.0")
+        self.assertEqual(frame["id"], 1)
+        self.assertIn("result", frame)
+
+    @unittest.skipIf(MCP_INSTALLED, "mcp package installed")
+    def test_missing_mcp_reports_on_stderr_only(self):
+        """Test that startup diagnostics never reach stdout when MCP is unavailable"""
+        proc = run_main_mcp(b"")
+
+        self.assertEqual(proc.returncode, 1)
+        self.assertEqual(proc.stdout, b"")
+        self.assertIn(b"MCP not available", proc.stderr)
+
+LONG_ANSWER = "Use a password manager so every account gets its own strong, unique password."
+
+def make_cli(tokens):
+    """Build a GuardianCLI whose LLM streams the given tokens, without loading anything"""
+    cli = main.GuardianCLI.__new__(main.GuardianCLI)
+    cli.logger = logging.getLogger('TestGuardianCLI')
+    cli.logger.setLevel(logging.CRITICAL)
+    cli.prompt_manager = Mock()
+    cli.llm = Mock()
+    cli.llm.generate_response_stream.return_value = iter(tokens)
+    cli.llm.is_loaded.return_value = True
+    cli._load_fut = None
+    cli.family_manager = Mock()
+    cli.family_manager.process_family_query.return_value = {'response': "Original skill answer"}
+    return cli
+
+@unittest.skipUnless(main.LLM_AVAILABLE, "Guardian components not importable")
+class TestStreamedEnhancement(unittest.TestCase):
+    """Test cases for streaming LLM-enhanced answers to the terminal"""
+
+    def test_long_stream_is_printed_once(self):
+        """Test that a usable answer is streamed and the original is not printed"""
+        cli = make_cli([word + " " for word in LONG_ANSWER.split()])
+        with patch('sys.stdout', new_callable=io.StringIO) as stdout:
+            cli.process_family_query("How do I manage passwords?")
+
+        output = stdout.getvalue()
+        self.assertEqual(output.count(LONG_ANSWER.split()[-1]), 1)
+        self.assertNotIn("Original skill answer", output)
+        self.assertIn("Enhanced with AI reasoning", output)
+
+    def test_short_stream_falls_back_without_output(self):
+        """Test that a too-short answer is never shown and the original is printed instead"""
+        cli = make_cli(["Sure", "."])
+        with patch('sys.stdout', new_callable=io.StringIO) as stdout:
+            self.assertIsNone(cli._enhance_response_with_llm("question", {}, {}))
+        self.assertEqual(stdout.getvalue(), "")
+
+        cli = make_cli(["Sure", "."])
+        with patch('sys.stdout', new_callable=io.StringIO) as stdout:
+            cli.process_family_query("How do I manage passwords?")
+        self.assertEqual(stdout.getvalue().count("Original skill answer"), 1)
+        self.assertNotIn("Sure.", stdout.getvalue())
+
+    def test_error_stream_is_not_shown_as_answer(self):
+        """Test that an LLM error chunk falls back to the original answer"""
+        cli = make_cli(["Error generating response: model crashed while sampling the next token"])
+        with patch('sys.stdout', new_callable=io.StringIO) as stdout:
+            cli.process_family_query("How do I manage passwords?")
+
+        output = stdout.getvalue()
+        self.assertNotIn("Error generating response", output)
+        self.assertEqual(output.count("Original skill answer"), 1)
+
+class TestFamilyCLILoop(unittest.TestCase):
+    """Test cases for command dispatch in the family CLI loop"""
+
+    def run_commands(self, *commands):
+        """Feed commands to family_cli_loop and return the CLI for inspection"""
+        cli = make_cli([])
+        cli._setup_readline = Mock()
+        cli.analyze_family_security = Mock()
+        cli.run_family_skill = Mock()
+        cli.process_family_query = Mock()
+        with patch('builtins.input', side_effect=list(commands) + ['exit']), \
+                patch('sys.stdout', new_callable=io.StringIO):
+            cli.family_cli_loop()
+        return cli
+
+    def test_commands_split_on_any_whitespace(self):
+        """Test that tabs and repeated spaces separate words as str.split() does"""
+        cli = self.run_commands("family\tanalyze", "family   skill  scan\t--fast  now", "ask\t  Is my router safe?")
+
+        cli.analyze_family_security.assert_called_once_with()
+        cli.run_family_skill.assert_called_once_with('scan', '--fast', 'now')
+        cli.process_family_query.assert_called_once_with("Is my router safe?")
+
+class TestDefaultFamilyData(unittest.TestCase):
+    """Test cases for the shared default profile and query context"""
+
+    def test_defaults_are_read_only(self):
+        """Test that the module-level defaults cannot be modified"""
+        with self.assertRaises(TypeError):
+            main._DEFAULT_PROFILE['family_id'] = 'changed'
+        with self.assertRaises(TypeError):
+            main._DEFAULT_QUERY_CONTEXT['family_profile'] = {}
+
+    def test_nested_defaults_are_read_only(self):
+        """Test that members and preferences inside the defaults cannot be modified"""
+        with self.assertRaises(AttributeError):
+            main._DEFAULT_PROFILE['members'].append({'name': 'Intruder'})
+        with self.assertRaises(TypeError):
+            main._DEFAULT_PROFILE['members'][0]['age_group'] = 'child'
+        with self.assertRaises(TypeError):
+            main._DEFAULT_PROFILE['security_preferences']['threat_tolerance'] = 'high'
+        with self.assertRaises(TypeError):
+            main._DEFAULT_QUERY_CONTEXT['family_profile']['members'] = ()
+
+    def test_defaults_passed_without_copying(self):
+        """Test that the CLI hands the shared templates straight to the family manager"""
+        cli = make_cli([])
+        cli.family_manager.analyze_family_security.return_value = Mock(
+            status='secure', overall_score=90.0, findings=[], recommendations=[]
+        )
+        with patch('sys.stdout', new_callable=io.StringIO):
+            cli.analyze_family_security()
+        cli.family_manager.analyze_family_security.assert_called_once_with(main._DEFAULT_PROFILE)
+        self.assertIs(cli.family_manager.analyze_family_security.call_args[0][0], main._DEFAULT_PROFILE)
+
+if __name__ == '__main__':
+    unittest.main()
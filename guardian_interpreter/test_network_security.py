@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Test suite for NetworkSecurityManager request filtering
+Tests online mode and allowed-domain checks
+"""
+
+import unittest
+import logging
+from unittest.mock import patch
+from network_security import NetworkSecurityManager
+
+class TestNetworkSecurityManager(unittest.TestCase):
+    """Test cases for outbound request filtering"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.logger = logging.getLogger('TestNetworkSecurity')
+        self.logger.setLevel(logging.CRITICAL)
+
+        self.config = {
+            'network': {
+                'ALLOW_ONLINE': True,
+                'allowed_domains': ['Example.com']
+            }
+        }
+        self.manager = NetworkSecurityManager(self.config, self.logger, self.logger)
+
+    def test_offline_mode_blocks_everything(self):
+        """Test that requests are blocked when online mode is disabled"""
+        self.manager.disable_online_mode()
+        self.assertFalse(self.manager.is_request_allowed("https://example.com/"))
+
+        stats = self.manager.get_security_stats()
+        self.assertEqual(stats['blocked_attempts'], 1)
+        self.assertEqual(stats['recent_blocked'][0]['reason'], "Online mode disabled")
+
+    def test_allowed_domain_and_subdomains(self):
+        """Test that allowed domains match exactly and by subdomain, case-insensitively"""
+        self.assertTrue(self.manager.is_request_allowed("https://example.com/path"))
+        self.assertTrue(self.manager.is_request_allowed("https://API.Example.com/v1"))
+        self.assertTrue(self.manager.is_request_allowed("https://example.com:8443/"))
+        self.assertTrue(self.manager.is_request_allowed("https://user@example.com/"))
+
+    def test_unlisted_domains_blocked(self):
+        """Test that lookalike and unrelated domains are blocked"""
+        self.assertFalse(self.manager.is_request_allowed("https://badexample.com/"))
+        self.assertFalse(self.manager.is_request_allowed("https://example.com.evil.net/"))
+        self.assertFalse(self.manager.is_request_allowed("https://evil.net/?next=example.com"))
+
+    def test_large_allowlist_matching(self):
+        """Test subdomain matching for allowlists large enough to use the label trie"""
+        self.manager.enable_online_mode([f"site{i}.example.org" for i in range(100)] + ['Example.com'])
+        self.assertTrue(self.manager.is_request_allowed("https://site42.example.org/"))
+        self.assertTrue(self.manager.is_request_allowed("https://cdn.site99.example.org/"))
+        self.assertTrue(self.manager.is_request_allowed("https://api.example.com/"))
+        self.assertFalse(self.manager.is_request_allowed("https://example.org/"))
+        self.assertFalse(self.manager.is_request_allowed("https://site100.example.org/"))
+        self.assertFalse(self.manager.is_request_allowed("https://xsite1.example.org/"))
+
+    def test_invalid_url_blocked(self):
+        """Test that unparseable URLs are blocked"""
+        self.assertFalse(self.manager.is_request_allowed("http://[::1"))
+        self.assertIn("URL parsing error", self.manager.get_blocked_attempts()[-1]['reason'])
+
+    def test_domain_list_updates(self):
+        """Test adding and removing allowed domains at runtime"""
+        self.manager.add_allowed_domain("guardian.local")
+        self.assertTrue(self.manager.is_request_allowed("http://node.guardian.local/"))
+
+        self.manager.remove_allowed_domain("guardian.local")
+        self.assertFalse(self.manager.is_request_allowed("http://node.guardian.local/"))
+
+    def test_cached_decision_follows_domain_changes(self):
+        """Test that a cached verdict is dropped when the allowed domains change"""
+        self.assertFalse(self.manager.is_request_allowed("https://guardian.local/"))
+        self.manager.add_allowed_domain("guardian.local")
+        self.assertTrue(self.manager.is_request_allowed("https://guardian.local/"))
+
+        self.assertTrue(self.manager.is_request_allowed("https://example.com/"))
+        self.manager.update_config({'network': {'ALLOW_ONLINE': True, 'allowed_domains': ['guardian.local']}})
+        self.assertFalse(self.manager.is_request_allowed("https://example.com/"))
+        self.assertTrue(self.manager.is_request_allowed("https://guardian.local/"))
+
+        self.manager.enable_online_mode(['example.com'])
+        self.assertTrue(self.manager.is_request_allowed("https://example.com/"))
+        self.assertFalse(self.manager.is_request_allowed("https://guardian.local/"))
+
+    def test_cached_allow_dropped_with_config_domain(self):
+        """Test that a cached allow verdict does not outlive the domain's removal from the config"""
+        for _ in range(3):
+            self.assertTrue(self.manager.is_request_allowed("https://api.example.com/"))
+
+        self.config['network']['allowed_domains'] = ['guardian.local']
+        self.assertFalse(self.manager.is_request_allowed("https://api.example.com/"))
+
+        self.config['network']['allowed_domains'].append('example.com')
+        self.assertTrue(self.manager.is_request_allowed("https://api.example.com/"))
+        self.config['network']['allowed_domains'].pop()
+        self.assertFalse(self.manager.is_request_allowed("https://api.example.com/"))
+
+    def test_allowlist_edited_in_place(self):
+        """Test that edits made directly to the configured domain list take effect"""
+        self.config['network']['allowed_domains'].append('foo.org')
+        self.assertTrue(self.manager.is_request_allowed("https://foo.org/"))
+
+        self.config['network']['allowed_domains'].remove('foo.org')
+        self.assertFalse(self.manager.is_request_allowed("https://foo.org/"))
+
+        self.config['network']['allowed_domains'][0] = 'guardian.local'
+        self.assertFalse(self.manager.is_request_allowed("https://example.com/"))
+        self.assertTrue(self.manager.is_request_allowed("https://guardian.local/"))
+
+        # Updates through the manager see the edited list, too
+        self.manager.add_allowed_domain('example.com')
+        self.assertEqual(self.manager.network_config['allowed_domains'], ['guardian.local', 'example.com'])
+
+    def test_mode_flags_follow_config(self):
+        """Test that online mode and allowed-request logging track the live config"""
+        self.config['network']['ALLOW_ONLINE'] = False
+        self.assertFalse(self.manager.is_request_allowed("https://example.com/"))
+        self.assertFalse(self.manager.get_security_stats()['online_mode'])
+
+        self.config['network']['ALLOW_ONLINE'] = True
+        self.config['network']['log_allowed_requests'] = True
+        with self.assertLogs(self.logger, logging.INFO) as logs:
+            self.assertTrue(self.manager.is_request_allowed("https://example.com/"))
+        self.assertIn("ALLOWED REQUEST: GET https://example.com/ - ALLOWED", logs.output[0])
+
+    def test_domain_list_normalized(self):
+        """Test that domain updates and hosts compare in normalized form"""
+        self.manager.add_allowed_domain("EXAMPLE.com.")
+        self.assertEqual(self.manager.network_config['allowed_domains'], ['Example.com'])
+        self.assertTrue(self.manager.is_request_allowed("https://example.com./"))
+
+        self.manager.remove_allowed_domain("example.com")
+        self.assertEqual(self.manager.network_config['allowed_domains'], [])
+
+    def test_no_allowlist_allows_any_domain(self):
+        """Test that online mode without an allowlist permits any domain"""
+        self.manager.remove_allowed_domain("Example.com")
+        self.assertTrue(self.manager.is_request_allowed("https://anything.org/"))
+        self.assertEqual(len(self.manager.get_allowed_requests()), 1)
+
+    def test_non_network_schemes_blocked(self):
+        """Test that data: and blob: URLs are rejected even without an allowlist"""
+        self.manager.remove_allowed_domain("Example.com")
+        self.assertFalse(self.manager.is_request_allowed("data:text/plain,hello"))
+        self.assertFalse(self.manager.is_request_allowed("BLOB:https://example.com/uuid"))
+        self.assertEqual(self.manager.get_blocked_attempts()[-1]['reason'], "Non-network URL scheme")
+
+    def test_blocked_request_logging(self):
+        """Test that blocked requests are logged with the original wording and call site"""
+        blocked_logger = logging.getLogger('TestNetworkSecurity.Blocked')
+        manager = NetworkSecurityManager(self.config, self.logger, blocked_logger)
+
+        with self.assertLogs(blocked_logger, logging.WARNING) as logs:
+            manager.is_request_allowed("https://evil.net/", "POST")
+
+        record, = logs.records
+        self.assertEqual(
+            record.getMessage(), "POST https://evil.net/ - BLOCKED: Domain evil.net not in allowed list"
+        )
+        self.assertEqual(record.funcName, 'is_request_allowed')
+        self.assertEqual(record.pathname, manager.is_request_allowed.__code__.co_filename)
+
+        # A blocked logger outside the main hierarchy gets its own line on both
+        other_logger = logging.getLogger('TestBlockedElsewhere')
+        manager = NetworkSecurityManager(self.config, self.logger, other_logger)
+        with self.assertLogs(self.logger, logging.WARNING) as logs:
+            manager.is_request_allowed("https://evil.net/")
+        self.assertEqual(
+            logs.records[0].getMessage(),
+            "BLOCKED REQUEST: GET https://evil.net/ - BLOCKED: Domain evil.net not in allowed list"
+        )
+
+    def test_connectivity_check_cached(self):
+        """Test that connectivity results are reused until invalidated"""
+        with patch('network_security._has_default_gateway', return_value=True) as gateway:
+            first = self.manager.check_network_connectivity()
+            first['interfaces'].append({'interface': 'fake0'})
+
+            second = self.manager.check_network_connectivity()
+            self.assertEqual(gateway.call_count, 1)
+            self.assertTrue(second['gateway_reachable'])
+            self.assertNotIn({'interface': 'fake0'}, second['interfaces'])
+
+            self.manager.invalidate_connectivity_cache()
+            self.manager.check_network_connectivity()
+            self.assertEqual(gateway.call_count, 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -9,6 +9,8 @@ import tempfile
 import os
 import shutil
 import logging
+import dataclasses
+import sys
 from unittest.mock import Mock, patch
 from datetime import datetime
 
@@ -104,6 +106,20 @@ def analyze(target=None, **kwargs):
         self.assertIn('testprotocol1_protocol', self.protocol_manager.protocol_modules)
         self.assertIn('testprotocol2_protocol', self.protocol_manager.protocol_modules)
     
+    def test_reload_reuses_unchanged_modules(self):
+        """Test that reloading skips re-importing files that have not changed"""
+        self.create_test_protocol_module('TestProtocol')
+        self.protocol_manager.load_protocol_modules()
+        first = self.protocol_manager.protocol_modules['testprotocol_protocol'].loaded_module
+        
+        self.protocol_manager.load_protocol_modules()
+        self.assertIs(self.protocol_manager.protocol_modules['testprotocol_protocol'].loaded_module, first)
+        
+        # Rewriting the file with a different size forces a fresh import
+        self.create_test_protocol_module('TestProtocol', status='warning')
+        self.protocol_manager.load_protocol_modules()
+        self.assertIsNot(self.protocol_manager.protocol_modules['testprotocol_protocol'].loaded_module, first)
+    
     def test_list_protocol_modules(self):
         """Test listing protocol modules"""
         # Create and load test module
@@ -185,6 +201,44 @@ def analyze(target=None, **kwargs):
         self.assertIn('serious security issues', summary)
         self.assertIn('need attention', summary)
     
+    def test_summary_fixed_at_analysis_time(self):
+        """Test that a result keeps the summary style in effect when it was produced"""
+        self.create_test_protocol_module('TestProtocol', findings=[{'severity': 'low'}])
+        self.protocol_manager.load_protocol_modules()
+        
+        result = self.protocol_manager.run_protocol_analysis('testprotocol_protocol')
+        self.protocol_manager.disable_family_mode()
+        self.assertIn('1 item to review', result.family_friendly_summary)
+        
+        # Plain dataclass fields: replace() and asdict() see the stored values
+        copied = dataclasses.replace(result, status='warning')
+        self.assertEqual(copied.family_friendly_summary, result.family_friendly_summary)
+        self.assertEqual(copied.timestamp_iso(), copied.timestamp.isoformat())
+        self.assertEqual(dataclasses.asdict(result)['family_friendly_summary'], result.family_friendly_summary)
+    
+    def test_analysis_results_are_immutable(self):
+        """Test that stored analysis results cannot be rebound"""
+        self.create_test_protocol_module('TestProtocol')
+        self.protocol_manager.load_protocol_modules()
+        result = self.protocol_manager.run_protocol_analysis('testprotocol_protocol')
+        
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            result.status = 'critical'
+        self.assertIn('Great news', result.family_friendly_summary)
+    
+    @unittest.skipIf(sys.version_info < (3, 10), "slotted dataclasses need Python 3.10")
+    def test_results_and_modules_are_slotted(self):
+        """Test that results and module metadata carry no per-instance __dict__"""
+        self.create_test_protocol_module('TestProtocol')
+        self.protocol_manager.load_protocol_modules()
+        result = self.protocol_manager.run_protocol_analysis('testprotocol_protocol')
+        module = self.protocol_manager.protocol_modules['testprotocol_protocol']
+        
+        self.assertFalse(hasattr(result, '__dict__'))
+        self.assertFalse(hasattr(module, '__dict__'))
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            module.version = '2.0'
+    
     def test_format_family_friendly_report(self):
         """Test family-friendly report formatting"""
         # Create test result
@@ -280,6 +334,28 @@ def analyze(target=None, **kwargs):
         self.assertIn('status_breakdown', summary)
         self.assertIn('recent_results', summary)
         self.assertTrue(summary['family_friendly_mode'])
+        
+        latest = self.protocol_manager.get_analysis_results(limit=1)[0]
+        self.assertEqual(summary['recent_results'][-1]['timestamp'], latest.timestamp.isoformat())
+
+    def test_status_breakdown_tracks_eviction(self):
+        """Test that status counts drop results evicted from the history"""
+        self.create_test_protocol_module('TestProtocol')
+        self.protocol_manager.load_protocol_modules()
+        maxlen = self.protocol_manager.analysis_results.maxlen
+        
+        self.protocol_manager.run_protocol_analysis('testprotocol_protocol')
+        result = self.protocol_manager.analysis_results[0]
+        for _ in range(maxlen):
+            self.protocol_manager._append_result(
+                dataclasses.replace(result, status='warning')
+            )
+        
+        summary = self.protocol_manager.get_protocol_summary()
+        self.assertEqual(summary['total_analyses'], maxlen)
+        self.assertEqual(summary['status_breakdown'], {'warning': maxlen})
+        self.assertEqual(len(self.protocol_manager.get_analysis_results('testprotocol_protocol', limit=maxlen)), maxlen)
+        self.assertEqual(self.protocol_manager.get_analysis_results('other_protocol'), [])
     
     def test_enable_disable_family_mode(self):
         """Test enabling and disabling family mode"""
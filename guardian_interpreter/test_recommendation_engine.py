@@ -212,6 +212,15 @@ class TestRecommendationEngine(unittest.TestCase):
         result = self.engine.mark_recommendation_completed("nonexistent_id")
         self.assertFalse(result)
     
+    def test_data_version_tracks_template_reloads(self):
+        """Test data version changes on template reload but not on generation"""
+        version = self.engine.data_version
+        self.engine.generate_recommendations(self.family_profile)
+        self.assertEqual(self.engine.data_version, version)
+        
+        self.engine._load_recommendation_templates()
+        self.assertNotEqual(self.engine.data_version, version)
+    
     def test_get_active_recommendations(self):
         """Test getting active (non-completed, non-expired) recommendations"""
         recommendations = self.engine.generate_recommendations(self.family_profile)